@@ -0,0 +1,123 @@
+"""
+Benchmarks of the ipsatization report on synthetic review scores.
+
+Cases:
+- matrix: ipsatize a reviewer × artifact score matrix held in memory; for the sizes where it
+  finishes in reasonable time, the DataFrame implementation the report used to run is timed
+  on the same matrix (`legacy seconds`)
+- report: load the matrix of a synthetic course from the database and ipsatize it
+
+`--sizes` is the number of reviewers (one artifact each), `--min-reviewers` the number of
+reviews per artifact.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+
+from app.gamification.benchmarks.review_assignment import build_course
+from app.gamification.benchmarks.utils import measure
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.utils.ipsatization import ipsatize, review_score_matrix
+from app.gamification.utils.review_assign import assign_due_surveys
+
+DEFAULT_SIZES = [100, 400, 2000]
+DEFAULT_MIN_REVIEWERS = [4, 8]
+# Largest matrix the DataFrame implementation is timed on, it is quadratic in Python
+LEGACY_MAX_SIZE = 400
+
+
+def pandas_ipsatization(matrix, ipsatization_MAX, ipsatization_MIN):
+    """
+    The DataFrame implementation the report used to run, kept as a reference.
+    """
+    df = pd.DataFrame(matrix, dtype=float)
+    m = df.mean(axis=1)
+    for i, col in enumerate(df):
+        df.iloc[:, i] = df.iloc[:, i].fillna(m)
+    means = df.mean(axis=1)
+    stds = df.std(axis=1)
+    i_data = df.copy()
+    for i in range(len(df)):
+        for j in range(len(df.columns)):
+            i_data.iloc[i, j] = (df.iloc[i, j] - means[i]) / stds[i] if stds[i] != 0 else (df.iloc[i, j] - 0.5) * 2
+    i_means = list(i_data.mean())
+    normalized = [(value - min(i_means)) / (max(i_means) - min(i_means)) for value in i_means]
+    return [score * (ipsatization_MAX - ipsatization_MIN) + ipsatization_MIN for score in normalized]
+
+
+def synthetic_scores(reviewers, reviews_per_artifact, seed=0):
+    """
+    Square reviewer × artifact masked matrix where every artifact has `reviews_per_artifact`
+    random reviewers and every reviewer a personal bias.
+    """
+    rng = np.random.default_rng(seed)
+    quality = rng.random(reviewers)
+    bias = rng.normal(0, 0.1, (reviewers, 1))
+    data = np.clip(quality + bias + rng.normal(0, 0.05, (reviewers, reviewers)), 0, 1)
+    mask = np.ones(data.shape, dtype=bool)
+    for artifact in range(reviewers):
+        mask[rng.choice(reviewers, size=min(reviews_per_artifact, reviewers), replace=False), artifact] = False
+    return np.ma.masked_array(data, mask)
+
+
+def run_matrix(scenario):
+    students, min_reviewers = scenario["students"], scenario["min_reviewers"]
+    scores = synthetic_scores(students, min_reviewers)
+    with measure() as measurement:
+        ipsatize(scores)
+    legacy = "-"
+    if students <= LEGACY_MAX_SIZE:
+        start = time.perf_counter()
+        pandas_ipsatization(scores.filled(np.nan).tolist(), 100, 80)
+        legacy = f"{time.perf_counter() - start:.4f}"
+    return {
+        **scenario,
+        "case": "matrix",
+        "seconds": f"{measurement.seconds:.4f}",
+        "queries": measurement.queries,
+        "legacy seconds": legacy,
+    }
+
+
+def run_report(scenario):
+    """
+    Build a course whose reviews are all completed with random scores, measure the report
+    computation and roll everything back.
+    """
+    students, min_reviewers = scenario["students"], scenario["min_reviewers"]
+    rng = np.random.default_rng(0)
+    with transaction.atomic():
+        assignment, _ = build_course(students, students, students, min_reviewers, Assignment.AssigmentType.Individual)
+        assign_due_surveys()
+        reviews = list(ArtifactReview.objects.filter(artifact__assignment=assignment))
+        for review in reviews:
+            review.status = ArtifactReview.ArtifactReviewType.COMPLETED
+            review.artifact_review_score = int(rng.integers(0, 101))
+            review.max_artifact_review_score = 100
+        ArtifactReview.objects.bulk_update(
+            reviews, ["status", "artifact_review_score", "max_artifact_review_score"], batch_size=1000
+        )
+        with measure() as measurement:
+            _, _, scores = review_score_matrix(assignment.id)
+            ipsatize(scores)
+        transaction.set_rollback(True)
+    return {
+        **scenario,
+        "case": "report",
+        "seconds": f"{measurement.seconds:.4f}",
+        "queries": measurement.queries,
+        "legacy seconds": "-",
+    }
+
+
+def run(sizes=None, min_reviewers=None, **options):
+    rows = []
+    for students in sizes or DEFAULT_SIZES:
+        for count in min_reviewers or DEFAULT_MIN_REVIEWERS:
+            scenario = {"students": students, "min_reviewers": count}
+            rows.append(run_matrix(scenario))
+            rows.append(run_report(scenario))
+    return rows
@@ -0,0 +1,32 @@
+"""
+Benchmarks of the score normalizers on large synthetic review score matrices.
+
+Every normalizer of `app.gamification.utils.normalizers.NORMALIZERS` is timed on the same
+reviewer × artifact matrix. `--sizes` is the number of reviewers (one artifact each),
+`--min-reviewers` the number of reviews per artifact.
+"""
+from app.gamification.benchmarks.ipsatization import synthetic_scores
+from app.gamification.benchmarks.utils import measure
+from app.gamification.utils.normalizers import NORMALIZERS, normalize
+
+DEFAULT_SIZES = [400, 2000, 5000]
+DEFAULT_MIN_REVIEWERS = [4, 16]
+
+
+def run(sizes=None, min_reviewers=None, **options):
+    rows = []
+    for students in sizes or DEFAULT_SIZES:
+        for count in min_reviewers or DEFAULT_MIN_REVIEWERS:
+            scores = synthetic_scores(students, count)
+            for method in NORMALIZERS:
+                with measure() as measurement:
+                    normalize(scores, method)
+                rows.append(
+                    {
+                        "students": students,
+                        "min_reviewers": count,
+                        "method": method,
+                        "seconds": f"{measurement.seconds:.4f}",
+                    }
+                )
+    return rows
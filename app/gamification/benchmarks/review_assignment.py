@@ -0,0 +1,168 @@
+"""
+Benchmarks of the review-assignment hot paths on synthetic courses.
+
+Cases:
+- batch: release a survey and assign every review with each `review_assign_policy`
+- late: one individual artifact submitted after the survey was released
+- team: team artifacts uploaded one after the other (all-to-all fan-out)
+
+Each case runs in a transaction that is rolled back, so cases do not see each other's rows.
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from app.gamification.benchmarks.utils import distribution, measure
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual, Team
+from app.gamification.models.membership import Membership
+from app.gamification.models.registration import Registration
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.review_assign import assign_due_surveys
+from app.gamification.views.api.artifacts import AssignmentArtifact
+
+DEFAULT_SIZES = [50, 200, 1000]
+DEFAULT_MIN_REVIEWERS = [2, 4]
+TEAM_SIZE = 4
+# Share of the entities that submitted before the survey release, the rest submit late
+SUBMISSION_RATE = 0.9
+
+
+def build_course(students, teams, artifacts, min_reviewers, assignment_type, policy=Assignment.ReviewerAssignPolicy.A):
+    """
+    Create a course with `students` registrations grouped in `teams` entities (one Individual
+    per student for individual assignments), an assignment, a due survey and `artifacts` artifacts.
+    Returns (assignment, entities without an artifact).
+    """
+    course = Course.objects.create(course_number="BENCH", course_name="Benchmark course")
+    prefix = f"bench{course.id}_"
+    CustomUser.objects.bulk_create(
+        [CustomUser(andrew_id=f"{prefix}{index}", email=f"{prefix}{index}@example.com") for index in range(students)]
+    )
+    users = CustomUser.objects.filter(andrew_id__startswith=prefix)
+    Registration.objects.bulk_create([Registration(user=user, course=course) for user in users])
+    registration_ids = list(Registration.objects.filter(course=course).order_by("id").values_list("id", flat=True))
+
+    memberships = []
+    entities = []
+    if assignment_type == Assignment.AssigmentType.Team:
+        for index in range(teams):
+            entities.append(Team.objects.create(course=course, name=f"Team {index}"))
+        for index, registration_id in enumerate(registration_ids):
+            memberships.append(Membership(student_id=registration_id, entity=entities[index % teams]))
+    else:
+        for registration_id in registration_ids:
+            entity = Individual.objects.create(course=course)
+            entities.append(entity)
+            memberships.append(Membership(student_id=registration_id, entity=entity))
+    Membership.objects.bulk_create(memberships)
+
+    now = timezone.now()
+    assignment = Assignment.objects.create(
+        course=course,
+        assignment_name="Benchmark assignment",
+        assignment_type=assignment_type,
+        review_assign_policy=policy,
+        min_reviewers=min_reviewers,
+        date_released=now - timedelta(days=7),
+        date_due=now + timedelta(days=7),
+    )
+    FeedbackSurvey.objects.create(
+        assignment=assignment, date_released=now - timedelta(minutes=1), date_due=now + timedelta(days=7)
+    )
+    Artifact.objects.bulk_create(
+        [Artifact(assignment=assignment, entity=entity, upload_time=now) for entity in entities[:artifacts]]
+    )
+    return assignment, entities[artifacts:]
+
+
+def fairness(assignment):
+    """
+    Reviews per student (students without any review count as 0) and reviewers per artifact.
+    """
+    reviews = ArtifactReview.objects.filter(artifact__assignment=assignment)
+    per_student = Counter(
+        dict(reviews.order_by().values_list("user_id").annotate(count=Count("id")))
+    )
+    for registration_id in Registration.objects.filter(course_id=assignment.course_id).values_list("id", flat=True):
+        per_student.setdefault(registration_id, 0)
+    per_artifact = Counter(
+        dict(
+            Artifact.objects.filter(assignment=assignment)
+            .annotate(count=Count("artifactreview"))
+            .values_list("id", "count")
+        )
+    )
+    return distribution(per_student.values()), distribution(per_artifact.values())
+
+
+def report(scenario, case, policy, measurement, assignment):
+    per_student, per_artifact = fairness(assignment)
+    return {
+        **scenario,
+        "case": case,
+        "policy": policy,
+        "seconds": f"{measurement.seconds:.4f}",
+        "queries": measurement.queries,
+        "reviews/student": "{min}/{mean}/{max} sd {std}".format(**per_student),
+        "reviewers/artifact": "{min}/{mean}/{max} sd {std}".format(**per_artifact),
+    }
+
+
+def submit_late(assignment, entity):
+    artifact = Artifact.objects.create(assignment=assignment, entity=entity, upload_time=timezone.now())
+    AssignmentArtifact().create_artifact_review(
+        artifact, None, assignment.course, assignment.assignment_type, entity
+    )
+
+
+def run_case(case, scenario, policy=None):
+    """
+    Build the course of a scenario, measure one case and roll everything back.
+    """
+    students, min_reviewers = scenario["students"], scenario["min_reviewers"]
+    with transaction.atomic():
+        if case == "team":
+            teams = max(students // TEAM_SIZE, 2)
+            assignment, _ = build_course(students, teams, teams, min_reviewers, Assignment.AssigmentType.Team)
+            artifacts = list(Artifact.objects.filter(assignment=assignment).select_related("assignment", "entity"))
+            with measure() as measurement:
+                for artifact in artifacts:
+                    AssignmentArtifact().create_artifact_review(
+                        artifact, None, assignment.course, assignment.assignment_type, artifact.entity
+                    )
+        else:
+            submitted = max(int(students * SUBMISSION_RATE), 2)
+            assignment, missing = build_course(
+                students, students, submitted, min_reviewers, Assignment.AssigmentType.Individual, policy
+            )
+            if case == "batch":
+                with measure() as measurement:
+                    assign_due_surveys()
+            else:
+                assign_due_surveys()
+                with measure() as measurement:
+                    for entity in missing:
+                        submit_late(assignment, entity)
+        row = report(scenario, case, policy or "-", measurement, assignment)
+        transaction.set_rollback(True)
+    return row
+
+
+def run(sizes=None, min_reviewers=None, **options):
+    rows = []
+    for students in sizes or DEFAULT_SIZES:
+        for count in min_reviewers or DEFAULT_MIN_REVIEWERS:
+            scenario = {"students": students, "min_reviewers": count}
+            for policy in Assignment.ReviewerAssignPolicy.values:
+                rows.append(run_case("batch", scenario, policy))
+            rows.append(run_case("late", scenario, Assignment.ReviewerAssignPolicy.A))
+            rows.append(run_case("team", scenario))
+    return rows
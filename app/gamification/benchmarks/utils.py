@@ -0,0 +1,51 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class Measurement:
+    def __init__(self):
+        self.seconds = 0.0
+        self.queries = 0
+
+
+@contextmanager
+def measure():
+    """
+    Time a block and count the SQL statements it runs.
+    """
+    measurement = Measurement()
+    with CaptureQueriesContext(connection) as captured:
+        start = time.perf_counter()
+        yield measurement
+        measurement.seconds = time.perf_counter() - start
+    measurement.queries = len(captured)
+
+
+def distribution(values):
+    """
+    min / mean / max / standard deviation of a list of counts, for fairness reports.
+    """
+    values = list(values) or [0]
+    return {
+        "min": min(values),
+        "mean": round(statistics.mean(values), 2),
+        "max": max(values),
+        "std": round(statistics.pstdev(values), 2),
+    }
+
+
+def format_table(rows):
+    if not rows:
+        return ""
+    columns = list(rows[0].keys())
+    cells = [[str(row.get(column, "")) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(cell[index]) for cell in cells)) for index, column in enumerate(columns)]
+    lines = ["  ".join(column.ljust(width) for column, width in zip(columns, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    for cell in cells:
+        lines.append("  ".join(value.ljust(width) for value, width in zip(cell, widths)))
+    return "\n".join(lines)
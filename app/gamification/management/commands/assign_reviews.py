@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.utils.review_assign import (
+    REVIEW_ASSIGN_STRATEGIES,
+    assign_due_surveys,
+    assign_reviews,
+    preview_review_plan,
+)
+
+
+class Command(BaseCommand):
+    help = "Release due feedback surveys and assign their artifact reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assignment", type=int, help="Only (re)assign reviews for this assignment id.")
+        parser.add_argument(
+            "--policy",
+            choices=sorted(REVIEW_ASSIGN_STRATEGIES),
+            help="Override the assignment's review_assign_policy.",
+        )
+        parser.add_argument("--seed", type=int, help="Seed for randomized policies, defaults to the assignment id.")
+        parser.add_argument("--dry-run", action="store_true", help="Print the plan without writing anything.")
+
+    def handle(self, *args, **options):
+        if options["assignment"] is not None:
+            try:
+                assignments = [Assignment.objects.get(pk=options["assignment"])]
+            except Assignment.DoesNotExist:
+                raise CommandError(f"Assignment {options['assignment']} does not exist")
+        elif options["dry_run"]:
+            assignments = [
+                survey.assignment
+                for survey in FeedbackSurvey.objects.filter(
+                    is_released=False, date_released__lte=timezone.now(), assignment__isnull=False
+                ).select_related("assignment")
+            ]
+        else:
+            result = assign_due_surveys()
+            for survey_id, created in result.items():
+                self.stdout.write(f"Survey {survey_id}: assigned {created} artifact reviews")
+            self.stdout.write(self.style.SUCCESS(f"Released {len(result)} survey(s)"))
+            return
+
+        for assignment in assignments:
+            if options["dry_run"]:
+                self.print_preview(assignment, preview_review_plan(assignment, options["policy"], options["seed"]))
+            else:
+                created = assign_reviews(assignment, options["policy"], options["seed"])
+                self.stdout.write(
+                    self.style.SUCCESS(f"Assignment {assignment.pk}: assigned {created} artifact reviews")
+                )
+
+    def print_preview(self, assignment, preview):
+        reviews = preview["reviews_per_reviewer"].values()
+        reviewers = preview["reviewers_per_artifact"].values()
+        self.stdout.write(
+            f"Assignment {assignment.pk} ({assignment.assignment_name}), policy {preview['policy']}: "
+            f"{len(preview['pairs'])} reviews"
+        )
+        if preview["pairs"]:
+            self.stdout.write(f"  reviews per reviewer: min {min(reviews)}, max {max(reviews)}")
+            self.stdout.write(f"  reviewers per artifact: min {min(reviewers)}, max {max(reviewers)}")
+        for artifact_id, registration_id in preview["pairs"]:
+            self.stdout.write(f"  artifact {artifact_id} <- registration {registration_id}")
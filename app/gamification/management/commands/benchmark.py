@@ -0,0 +1,38 @@
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from app.gamification.benchmarks.utils import format_table
+
+SUITES = {
+    "ipsatization": "app.gamification.benchmarks.ipsatization",
+    "normalizers": "app.gamification.benchmarks.normalizers",
+    "review_assignment": "app.gamification.benchmarks.review_assignment",
+}
+
+
+def int_list(value):
+    return [int(item) for item in value.split(",") if item]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a benchmark suite on synthetic data in a throwaway test database. "
+        "Use the SQLite test settings with TEST=True."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("suite", choices=sorted(SUITES), help="Benchmark suite to run.")
+        parser.add_argument("--sizes", type=int_list, help="Comma separated course sizes (number of students).")
+        parser.add_argument("--min-reviewers", type=int_list, help="Comma separated min_reviewers values.")
+
+    def handle(self, *args, **options):
+        suite = import_module(SUITES[options["suite"]])
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            rows = suite.run(sizes=options["sizes"], min_reviewers=options["min_reviewers"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        self.stdout.write(format_table(rows))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.gamification.models.course import Course
+from app.gamification.utils.ipsatization import normalize_scores
+
+
+class Command(BaseCommand):
+    help = "Compute and store the ipsatized artifact scores of every assignment of the given courses (default all)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course", type=int, action="append", dest="courses", help="Only normalize this course id (repeatable)."
+        )
+        parser.add_argument("--force", action="store_true", help="Recompute results that are still up to date.")
+        parser.add_argument("--loop", action="store_true", help="Keep running instead of exiting after one pass.")
+        parser.add_argument("--interval", type=int, default=300, help="Seconds between two passes with --loop.")
+
+    def handle(self, *args, **options):
+        courses = options["courses"]
+        if courses:
+            missing = set(courses) - set(Course.objects.filter(pk__in=courses).values_list("pk", flat=True))
+            if missing:
+                raise CommandError(f"Course(s) {', '.join(map(str, sorted(missing)))} do not exist")
+        while True:
+            stored = normalize_scores(courses or None, force=options["force"])
+            self.stdout.write(self.style.SUCCESS(f"Stored the normalized scores of {stored} assignment(s)"))
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
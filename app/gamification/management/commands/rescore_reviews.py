@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.utils.scoring import rescore_assignment
+
+
+class Command(BaseCommand):
+    help = "Recompute the scores of completed artifact reviews, e.g. after the scoring rules changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assignment", type=int, help="Only rescore the reviews of this assignment id.")
+
+    def handle(self, *args, **options):
+        if options["assignment"] is not None:
+            try:
+                assignments = [Assignment.objects.get(pk=options["assignment"])]
+            except Assignment.DoesNotExist:
+                raise CommandError(f"Assignment {options['assignment']} does not exist")
+        else:
+            assignments = Assignment.objects.filter(
+                artifact__artifactreview__status=ArtifactReview.ArtifactReviewType.COMPLETED
+            ).distinct()
+
+        for assignment in assignments:
+            rescored = rescore_assignment(assignment)
+            self.stdout.write(self.style.SUCCESS(f"Assignment {assignment.pk}: rescored {rescored} artifact reviews"))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.gamification.utils.survey_lifecycle import run_survey_lifecycle
+
+
+class Command(BaseCommand):
+    help = "Release due feedback surveys, assign their reviews and mark overdue reviews LATE."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep running instead of exiting after one pass.")
+        parser.add_argument("--interval", type=int, default=60, help="Seconds between two passes with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            result = run_survey_lifecycle()
+            for survey_id, created in result["released"].items():
+                self.stdout.write(f"Survey {survey_id}: released, assigned {created} artifact reviews")
+            if result["late"]:
+                self.stdout.write(f"Marked {result['late']} artifact review(s) LATE")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
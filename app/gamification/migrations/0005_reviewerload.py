@@ -0,0 +1,36 @@
+# Generated by Django 3.2 on 2026-10-18 18:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0004_alter_usertrivia_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewerLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0, verbose_name='review count')),
+                ('assignment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='gamification.assignment')),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='gamification.registration')),
+            ],
+            options={
+                'verbose_name': 'reviewer load',
+                'verbose_name_plural': 'reviewer loads',
+                'db_table': 'reviewer_load',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='reviewerload',
+            index=models.Index(fields=['assignment', 'review_count'], name='reviewer_load_count_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reviewerload',
+            constraint=models.UniqueConstraint(fields=('assignment', 'registration'), name='unique_reviewer_load'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2 on 2026-10-18 18:41
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_completed_reviews(apps, schema_editor):
+    Artifact = apps.get_model("gamification", "Artifact")
+    ArtifactReview = apps.get_model("gamification", "ArtifactReview")
+    completed = (
+        ArtifactReview.objects.filter(artifact=OuterRef("pk"), status="COMPLETED")
+        .order_by()
+        .values("artifact")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Artifact.objects.update(completed_review_count=Coalesce(Subquery(completed), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0005_reviewerload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artifact',
+            name='completed_review_count',
+            field=models.IntegerField(default=0, verbose_name='completed review count'),
+        ),
+        migrations.AddIndex(
+            model_name='artifact',
+            index=models.Index(fields=['assignment', 'completed_review_count'], name='artifact_review_count_idx'),
+        ),
+        migrations.RunPython(count_completed_reviews, migrations.RunPython.noop),
+    ]
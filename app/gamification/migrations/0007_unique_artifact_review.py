@@ -0,0 +1,48 @@
+# Generated by Django 3.2 on 2026-10-18 18:42
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def delete_duplicate_reviews(apps, schema_editor):
+    Artifact = apps.get_model("gamification", "Artifact")
+    ArtifactReview = apps.get_model("gamification", "ArtifactReview")
+    duplicates = (
+        ArtifactReview.objects.order_by()
+        .values_list("artifact_id", "user_id")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    artifact_ids = set()
+    for artifact_id, user_id, _ in duplicates:
+        artifact_ids.add(artifact_id)
+        reviews = list(ArtifactReview.objects.filter(artifact_id=artifact_id, user_id=user_id).order_by("id"))
+        # Keep a completed review (and its answers) over incomplete copies
+        keep = next((review for review in reviews if review.status == "COMPLETED"), reviews[0])
+        ArtifactReview.objects.filter(artifact_id=artifact_id, user_id=user_id).exclude(id=keep.id).delete()
+
+    # 0006 counted the completed reviews with the duplicates, recount the artifacts that had some
+    completed = (
+        ArtifactReview.objects.filter(artifact=OuterRef("pk"), status="COMPLETED")
+        .order_by()
+        .values("artifact")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Artifact.objects.filter(id__in=artifact_ids).update(completed_review_count=Coalesce(Subquery(completed), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0006_artifact_completed_review_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='artifactreview',
+            constraint=models.UniqueConstraint(fields=('artifact', 'user'), name='unique_artifact_review'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0007_unique_artifact_review'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['sender', 'receiver', 'type', 'timestamp'], name='notification_poke_idx'),
+        ),
+    ]
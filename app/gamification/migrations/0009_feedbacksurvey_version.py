@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0008_notification_poke_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedbacksurvey',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+SECTION_FIELDS = ("pk", "title", "description", "is_required")
+QUESTION_FIELDS = (
+    "pk",
+    "text",
+    "is_required",
+    "question_type",
+    "number_of_scale",
+    "number_of_text",
+    "gamified",
+    "phrased_positively",
+    "min",
+    "max",
+)
+
+
+def freeze_released_surveys(apps, schema_editor):
+    FeedbackSurvey = apps.get_model("gamification", "FeedbackSurvey")
+    SurveySection = apps.get_model("gamification", "SurveySection")
+    Question = apps.get_model("gamification", "Question")
+    OptionChoice = apps.get_model("gamification", "OptionChoice")
+    for survey in FeedbackSurvey.objects.filter(is_released=True):
+        snapshot = []
+        for section in SurveySection.objects.filter(survey=survey).order_by("pk"):
+            questions = []
+            for question in Question.objects.filter(section=section).order_by("pk"):
+                questions.append(
+                    {
+                        **{field: getattr(question, field) for field in QUESTION_FIELDS},
+                        "option_choices": list(
+                            OptionChoice.objects.filter(question=question).order_by("pk").values("pk", "text")
+                        ),
+                    }
+                )
+            snapshot.append({**{field: getattr(section, field) for field in SECTION_FIELDS}, "questions": questions})
+        survey.snapshot = snapshot
+        survey.save(update_fields=["snapshot"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0009_feedbacksurvey_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedbacksurvey',
+            name='snapshot',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(freeze_released_surveys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0010_feedbacksurvey_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedbacksurvey',
+            index=models.Index(fields=['assignment', '-id'], name='feedback_survey_latest_idx'),
+        ),
+    ]
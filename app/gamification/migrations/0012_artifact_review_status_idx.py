@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0011_feedback_survey_latest_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artifactreview',
+            index=models.Index(fields=['artifact', 'status'], name='artifact_review_status_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-18 19:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def index_answers(apps, schema_editor):
+    Answer = apps.get_model("gamification", "Answer")
+    answers = Answer.objects.order_by("artifact_review_id", "option_choice__question_id", "id").values_list(
+        "id", "artifact_review_id", "option_choice__question_id"
+    )
+    batch = []
+    previous, index = None, 0
+    for pk, artifact_review_id, question_id in answers.iterator():
+        index = index + 1 if (artifact_review_id, question_id) == previous else 0
+        previous = (artifact_review_id, question_id)
+        batch.append(Answer(id=pk, question_id=question_id, index=index))
+        if len(batch) == 1000:
+            Answer.objects.bulk_update(batch, ["question", "index"])
+            batch = []
+    Answer.objects.bulk_update(batch, ["question", "index"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0012_artifact_review_status_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='index',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='question',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='gamification.question'),
+        ),
+        migrations.RunPython(index_answers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='answer',
+            constraint=models.UniqueConstraint(fields=('artifact_review', 'question', 'index'), name='unique_answer_index'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 3.2 on 2026-10-18 19:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0013_answer_question_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignment',
+            name='review_version',
+            field=models.PositiveIntegerField(default=0, verbose_name='review version'),
+        ),
+        migrations.CreateModel(
+            name='IpsatizationResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_version', models.PositiveIntegerField(verbose_name='review version')),
+                ('ipsatization_min', models.IntegerField(verbose_name='ipsatization min')),
+                ('ipsatization_max', models.IntegerField(verbose_name='ipsatization max')),
+                ('artifact_ids', models.JSONField(default=list, verbose_name='artifact ids')),
+                ('scores', models.JSONField(default=list, verbose_name='scores')),
+                ('rows', models.JSONField(default=dict, verbose_name='rows')),
+                ('column_deltas', models.JSONField(default=list, verbose_name='column deltas')),
+                ('base_total', models.FloatField(default=0, verbose_name='base total')),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('assignment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='gamification.assignment')),
+            ],
+            options={
+                'verbose_name': 'ipsatization result',
+                'verbose_name_plural': 'ipsatization results',
+                'db_table': 'ipsatization_result',
+            },
+        ),
+    ]
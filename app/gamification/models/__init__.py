@@ -5,12 +5,14 @@ from .assignment import *
 from .behavior import *
 from .course import *
 from .entity import *
+from .ipsatization_result import *
 from .survey import *
 from .membership import *
 from .notification import *
 from .option_choice import *
 from .question import *
 from .registration import *
+from .reviewer_load import *
 from .reward import *
 from .survey_section import *
 from .trivia import *
@@ -10,12 +10,21 @@ class Answer(models.Model):
 
     option_choice = models.ForeignKey("OptionChoice", on_delete=models.CASCADE, default=None)
 
+    # The question of `option_choice`, and the position of the answer among the answers of the
+    # same review to that question; together they identify an answer when a draft is saved again
+    question = models.ForeignKey("Question", on_delete=models.CASCADE, null=True, blank=True)
+
+    index = models.PositiveIntegerField(default=0)
+
     answer_text = models.TextField(blank=True)
 
     class Meta:
         db_table = "answer"
         verbose_name = "answer"
         verbose_name_plural = "answers"
+        constraints = [
+            models.UniqueConstraint(fields=["artifact_review", "question", "index"], name="unique_answer_index"),
+        ]
 
 
 class ArtifactFeedback(Answer):
@@ -10,6 +10,8 @@ class Artifact(models.Model):
     
     uploader_id = models.IntegerField(default=0)
 
+    completed_review_count = models.IntegerField(_("completed review count"), default=0)
+
     entity = models.ForeignKey("Entity", on_delete=models.CASCADE)
 
     assignment = models.ForeignKey("Assignment", on_delete=models.CASCADE)
@@ -42,6 +44,9 @@ class Artifact(models.Model):
         db_table = "artifact"
         verbose_name = _("artifact")
         verbose_name_plural = _("artifacts")
+        indexes = [
+            models.Index(fields=["assignment", "completed_review_count"], name="artifact_review_count_idx"),
+        ]
 
     def __str__(self):
         return f"{self.assignment} - {self.entity} - {self.file}"
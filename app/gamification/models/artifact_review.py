@@ -24,3 +24,9 @@ class ArtifactReview(models.Model):
         db_table = "artifact_review"
         verbose_name = _("artifact_review")
         verbose_name_plural = _("artifact_reviews")
+        constraints = [
+            models.UniqueConstraint(fields=["artifact", "user"], name="unique_artifact_review"),
+        ]
+        indexes = [
+            models.Index(fields=["artifact", "status"], name="artifact_review_status_idx"),
+        ]
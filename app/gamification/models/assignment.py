@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from app.gamification.models.course import Course
@@ -48,28 +49,25 @@ class Assignment(models.Model):
 
     ipsatization_max = models.IntegerField(null=True, default=100, blank=True)
 
+    # Incremented whenever a review of the assignment is submitted, reopened or rescored
+    review_version = models.PositiveIntegerField(_("review version"), default=0)
+
     class Meta:
         db_table = "assignment"
         verbose_name = _("assignment")
         verbose_name_plural = _("assignments")
 
-    @property
+    @cached_property
     def survey(self):
-        feedback_survey = FeedbackSurvey.objects.filter(assignment=self)
-        if len(feedback_survey) > 0:
-            feedback_survey = feedback_survey.order_by('id').last()
-            return feedback_survey
-        else:
-            return None
+        """
+        The current feedback survey of the assignment, the latest one created.
+        A single indexed query, cached on the instance.
+        """
+        return FeedbackSurvey.objects.filter(assignment=self).order_by("-id").first()
 
     @property
     def feedback_survey(self):
-        feedback_survey = FeedbackSurvey.objects.filter(assignment=self)
-        if len(feedback_survey) > 0:
-            feedback_survey = feedback_survey[0]
-            return feedback_survey
-        else:
-            return None
+        return self.survey
 
     def __str__(self):
         return f"{self.assignment_name}"
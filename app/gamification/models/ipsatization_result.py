@@ -0,0 +1,40 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class IpsatizationResult(models.Model):
+    """
+    Ipsatized artifact scores of an assignment, kept with the per-reviewer terms they are
+    made of so that a change to one reviewer's reviews only updates that reviewer's terms.
+
+    `rows` maps each reviewer (registration id) to its `base`, the ipsatized value of the
+    artifacts it did not review, and its `deltas`, {artifact id: ipsatized score - base} for
+    the artifacts it did. `column_deltas` sums the deltas per artifact in `artifact_ids` order
+    and `base_total` sums the bases. The result is valid while `review_version` matches the
+    assignment's and the assignment still has the same artifacts.
+    """
+
+    assignment = models.OneToOneField("Assignment", on_delete=models.CASCADE)
+
+    review_version = models.PositiveIntegerField(_("review version"))
+
+    ipsatization_min = models.IntegerField(_("ipsatization min"))
+
+    ipsatization_max = models.IntegerField(_("ipsatization max"))
+
+    artifact_ids = models.JSONField(_("artifact ids"), default=list)
+
+    scores = models.JSONField(_("scores"), default=list)
+
+    rows = models.JSONField(_("rows"), default=dict)
+
+    column_deltas = models.JSONField(_("column deltas"), default=list)
+
+    base_total = models.FloatField(_("base total"), default=0)
+
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "ipsatization_result"
+        verbose_name = _("ipsatization result")
+        verbose_name_plural = _("ipsatization results")
@@ -19,6 +19,9 @@ class Notification(models.Model):
         db_table = "notifications"
         verbose_name = "notification"
         verbose_name_plural = "notifications"
+        indexes = [
+            models.Index(fields=["sender", "receiver", "type", "timestamp"], name="notification_poke_idx"),
+        ]
 
     def __str__(self):
         return f"{self.sender} -> {self.receiver}: ({self.type}) - {self.text}"
@@ -18,6 +18,21 @@ class Question(models.Model):
         SCALEMULTIPLECHOICE = "SCALEMULTIPLECHOICE"
         MULTIPLESELECT = "MULTIPLESELECT"
 
+    # Answer labels of a scale question by its `number_of_scale`, from disagree to agree
+    SCALE_LABELS = {
+        3: ["disagree", "neutral", "agree"],
+        5: ["strongly disagree", "disagree", "neutral", "agree", "strongly agree"],
+        7: [
+            "strongly disagree",
+            "disagree",
+            "weakly disagree",
+            "neutral",
+            "weakly agree",
+            "agree",
+            "strongly agree",
+        ],
+    }
+
     section = models.ForeignKey("SurveySection", on_delete=models.CASCADE)
 
     text = models.TextField(blank=True)
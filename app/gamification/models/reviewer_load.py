@@ -0,0 +1,26 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ReviewerLoad(models.Model):
+    """
+    Number of artifact reviews assigned to a registration within one assignment,
+    used to pick the least loaded reviewers without counting reviews on the fly.
+    """
+
+    assignment = models.ForeignKey("Assignment", on_delete=models.CASCADE)
+
+    registration = models.ForeignKey("Registration", on_delete=models.CASCADE)
+
+    review_count = models.IntegerField(_("review count"), default=0)
+
+    class Meta:
+        db_table = "reviewer_load"
+        verbose_name = _("reviewer load")
+        verbose_name_plural = _("reviewer loads")
+        constraints = [
+            models.UniqueConstraint(fields=["assignment", "registration"], name="unique_reviewer_load"),
+        ]
+        indexes = [
+            models.Index(fields=["assignment", "review_count"], name="reviewer_load_count_idx"),
+        ]
@@ -22,10 +22,19 @@ class FeedbackSurvey(models.Model):
     
     user = models.ForeignKey("CustomUser", null=True, blank=True, on_delete=models.CASCADE)
 
+    # Bumped on every edit of the survey or its contents, keys the cached survey tree and the ETags
+    version = models.PositiveIntegerField(default=1)
+
+    # Structure of the survey frozen when it is released, see utils.survey_tree.freeze_survey
+    snapshot = models.JSONField(null=True, blank=True)
+
     class Meta:
         db_table = "feedback_survey"
         verbose_name = "feedback survey"
         verbose_name_plural = "feedback surveys"
+        indexes = [
+            models.Index(fields=["assignment", "-id"], name="feedback_survey_latest_idx"),
+        ]
     
     @property
     def sections(self):
@@ -1,6 +1,38 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.survey import FeedbackSurvey
 
 
 class AssignmentTest(TestCase):
     def setUp(self):
         self.data = {}
+        self.assignment = Assignment.objects.create(
+            course=Course.objects.create(course_name="Course"), assignment_name="Assignment"
+        )
+
+    def test_survey_is_the_latest_and_cached(self):
+        # Arrange
+        FeedbackSurvey.objects.create(assignment=self.assignment, name="First")
+        latest = FeedbackSurvey.objects.create(assignment=self.assignment, name="Latest")
+        assignment = Assignment.objects.get(id=self.assignment.id)
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            survey = assignment.survey
+            feedback_survey = assignment.feedback_survey
+
+        # Assert
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(survey, latest)
+        self.assertEqual(feedback_survey, latest)
+
+    def test_survey_is_none_without_survey(self):
+        # Act
+        survey = self.assignment.survey
+
+        # Assert
+        self.assertIsNone(survey)
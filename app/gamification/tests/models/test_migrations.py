@@ -0,0 +1,58 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class UniqueArtifactReviewMigrationTest(TransactionTestCase):
+    before = [("gamification", "0006_artifact_completed_review_count")]
+    after = [("gamification", "0007_unique_artifact_review")]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.apps = executor.loader.project_state(self.before).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_are_deleted_and_completed_reviews_recounted(self):
+        # Arrange
+        model = self.apps.get_model
+        course = model("gamification", "Course").objects.create(course_name="Course")
+        assignment = model("gamification", "Assignment").objects.create(course=course, assignment_name="Assignment")
+        artifact = model("gamification", "Artifact").objects.create(
+            assignment=assignment, entity=model("gamification", "Individual").objects.create(course=course)
+        )
+        registrations = [
+            model("gamification", "Registration").objects.create(
+                user=model("gamification", "CustomUser").objects.create(
+                    andrew_id=f"user{index}", email=f"user{index}@example.com"
+                ),
+                course=course,
+            )
+            for index in range(2)
+        ]
+        ArtifactReview = model("gamification", "ArtifactReview")
+        for registration, status in [
+            (registrations[0], "COMPLETED"),
+            (registrations[0], "COMPLETED"),
+            (registrations[0], "INCOMPLETE"),
+            (registrations[1], "COMPLETED"),
+        ]:
+            ArtifactReview.objects.create(artifact=artifact, user=registration, status=status)
+        # As counted by 0006, before the duplicates are removed
+        model("gamification", "Artifact").objects.update(completed_review_count=3)
+
+        # Act
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+
+        # Assert
+        reviews = apps.get_model("gamification", "ArtifactReview").objects.order_by("user_id")
+        self.assertEqual(
+            list(reviews.values_list("user_id", "status")),
+            [(registrations[0].id, "COMPLETED"), (registrations[1].id, "COMPLETED")],
+        )
+        self.assertEqual(apps.get_model("gamification", "Artifact").objects.get().completed_review_count, 2)
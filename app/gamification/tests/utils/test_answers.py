@@ -0,0 +1,138 @@
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.gamification.models.answer import Answer, ArtifactFeedback
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual
+from app.gamification.models.option_choice import OptionChoice
+from app.gamification.models.question import Question
+from app.gamification.models.registration import Registration
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.survey_section import SurveySection
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.answers import answers_by_question, build_answers, question_answers, upsert_answers
+
+
+class AnswersByQuestionTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(course_name="Course")
+        assignment = Assignment.objects.create(course=course, assignment_name="Assignment")
+        section = SurveySection.objects.create(survey=FeedbackSurvey.objects.create(assignment=assignment))
+        self.text_question = Question.objects.create(section=section, question_type=Question.QuestionType.TEXTAREA)
+        self.slide_question = Question.objects.create(section=section, question_type=Question.QuestionType.SLIDEREVIEW)
+        text_option = OptionChoice.objects.create(question=self.text_question)
+        slide_option = OptionChoice.objects.create(question=self.slide_question)
+        artifact = Artifact.objects.create(assignment=assignment, entity=Individual.objects.create(course=course))
+        self.reviews = []
+        for index in range(3):
+            user = CustomUser.objects.create_user(andrew_id=f"reviewer{index}", email=f"reviewer{index}@example.com")
+            review = ArtifactReview.objects.create(
+                artifact=artifact, user=Registration.objects.create(user=user, course=course)
+            )
+            Answer.objects.create(artifact_review=review, option_choice=text_option, answer_text=f"text {index}")
+            ArtifactFeedback.objects.create(
+                artifact_review=review, option_choice=slide_option, answer_text=f"slide {index}", page="2"
+            )
+            self.reviews.append(review)
+
+    def test_answers_are_grouped_in_one_query(self):
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            grouped = answers_by_question([review.id for review in self.reviews])
+        text_answers = question_answers(grouped, self.text_question, self.reviews[1].id)
+        slide_answers = question_answers(grouped, self.slide_question, self.reviews[1].id)
+
+        # Assert
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([(answer["answer_text"], answer["page"]) for answer in text_answers], [("text 1", None)])
+        self.assertEqual([(answer["answer_text"], answer["page"]) for answer in slide_answers], [("slide 1", "2")])
+        self.assertEqual(text_answers[0]["reviewer_id"], self.reviews[1].user.user_id)
+
+
+class UpsertAnswersTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(course_name="Course")
+        assignment = Assignment.objects.create(course=course, assignment_name="Assignment")
+        section = SurveySection.objects.create(survey=FeedbackSurvey.objects.create(assignment=assignment))
+        self.choice_question = Question.objects.create(
+            section=section, question_type=Question.QuestionType.MULTIPLECHOICE, is_required=True
+        )
+        self.slide_question = Question.objects.create(section=section, question_type=Question.QuestionType.SLIDEREVIEW)
+        self.text_question = Question.objects.create(section=section, question_type=Question.QuestionType.TEXTAREA)
+        options = {self.choice_question: ["Yes", "No"], self.slide_question: [""], self.text_question: [""]}
+        for question, texts in options.items():
+            question.option_list = [OptionChoice.objects.create(question=question, text=text) for text in texts]
+        self.questions = {question.pk: question for question in options}
+        artifact = Artifact.objects.create(assignment=assignment, entity=Individual.objects.create(course=course))
+        user = CustomUser.objects.create_user(andrew_id="reviewer", email="reviewer@example.com")
+        self.review = ArtifactReview.objects.create(
+            artifact=artifact, user=Registration.objects.create(user=user, course=course)
+        )
+
+    def test_answers_are_saved_in_bulk(self):
+        # Arrange
+        Answer.objects.create(
+            artifact_review=self.review, option_choice=self.text_question.option_list[0], answer_text="old"
+        )
+        detail = [
+            {"question_pk": self.choice_question.pk, "answer_text": "No"},
+            {"question_pk": self.slide_question.pk, "answer_text": "slide 1", "page": "1"},
+            {"question_pk": self.slide_question.pk, "answer_text": "slide 2", "page": "2"},
+            {"question_pk": self.text_question.pk, "answer_text": ""},
+        ]
+
+        # Act
+        upsert_answers(self.review, build_answers(self.review, self.questions, detail))
+
+        # Assert
+        self.assertEqual(
+            [(answer.option_choice_id, answer.answer_text) for answer in Answer.objects.order_by("id")],
+            [
+                (self.choice_question.option_list[1].pk, "No"),
+                (self.slide_question.option_list[0].pk, "slide 1"),
+                (self.slide_question.option_list[0].pk, "slide 2"),
+            ],
+        )
+        self.assertEqual(list(ArtifactFeedback.objects.order_by("id").values_list("page", flat=True)), ["1", "2"])
+
+    def test_invalid_submission_is_rejected_before_writing(self):
+        # Arrange
+        detail = [
+            {"question_pk": self.text_question.pk, "answer_text": "text"},
+            {"question_pk": self.choice_question.pk, "answer_text": ""},
+        ]
+
+        # Act
+        with self.assertRaises(ValidationError) as error:
+            build_answers(self.review, self.questions, detail)
+
+        # Assert
+        self.assertEqual(error.exception.message, "Please answer all required questions.")
+        self.assertFalse(Answer.objects.exists())
+
+    def test_saving_a_draft_again_only_writes_changes(self):
+        # Arrange
+        detail = [
+            {"question_pk": self.slide_question.pk, "answer_text": "slide 1", "page": "1"},
+            {"question_pk": self.slide_question.pk, "answer_text": "slide 2", "page": "2"},
+            {"question_pk": self.text_question.pk, "answer_text": "text"},
+        ]
+        upsert_answers(self.review, build_answers(self.review, self.questions, detail, draft=True))
+        before = list(Answer.objects.order_by("id").values_list("id", flat=True))
+        detail[1]["page"] = "3"
+        detail[2]["answer_text"] = ""
+        detail.append({"question_pk": self.choice_question.pk, "answer_text": "Yes"})
+
+        # Act
+        changes = upsert_answers(self.review, build_answers(self.review, self.questions, detail))
+
+        # Assert
+        self.assertEqual(changes, {"created": 1, "updated": 1, "deleted": 1})
+        self.assertEqual(list(Answer.objects.order_by("id").values_list("id", flat=True))[:2], before[:2])
+        self.assertEqual(list(ArtifactFeedback.objects.order_by("index").values_list("page", flat=True)), ["1", "3"])
+        self.assertEqual(Answer.objects.get(question=self.choice_question).answer_text, "Yes")
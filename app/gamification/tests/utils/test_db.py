@@ -0,0 +1,67 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.gamification.models.answer import Answer, ArtifactFeedback
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual
+from app.gamification.models.option_choice import OptionChoice
+from app.gamification.models.question import Question
+from app.gamification.models.registration import Registration
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.survey_section import SurveySection
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.db import bulk_create_children, bulk_create_with_pks
+
+
+class BulkCreateChildrenTest(TestCase):
+    def test_only_child_rows_are_inserted(self):
+        # Arrange
+        course = Course.objects.create(course_name="Course")
+        assignment = Assignment.objects.create(course=course, assignment_name="Assignment")
+        section = SurveySection.objects.create(survey=FeedbackSurvey.objects.create(assignment=assignment))
+        question = Question.objects.create(section=section, question_type=Question.QuestionType.SLIDEREVIEW)
+        option_choice = OptionChoice.objects.create(question=question)
+        review = ArtifactReview.objects.create(
+            artifact=Artifact.objects.create(assignment=assignment, entity=Individual.objects.create(course=course)),
+            user=Registration.objects.create(
+                user=CustomUser.objects.create_user(andrew_id="reviewer", email="reviewer@example.com"),
+                course=course,
+            ),
+        )
+        parents = bulk_create_with_pks(
+            Answer,
+            [
+                Answer(artifact_review=review, option_choice=option_choice, question=question, index=index)
+                for index in range(3)
+            ],
+        )
+        children = [
+            ArtifactFeedback(
+                id=parent.pk,
+                answer_ptr_id=parent.pk,
+                artifact_review=review,
+                option_choice=option_choice,
+                question=question,
+                index=parent.index,
+                page=str(parent.index + 1),
+            )
+            for parent in parents
+        ]
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            bulk_create_children(ArtifactFeedback, children)
+
+        # Assert
+        self.assertEqual(len(queries), 1)
+        self.assertIn('INSERT INTO "artifact_feedback"', queries[0]["sql"])
+        self.assertEqual(Answer.objects.count(), 3)
+        self.assertEqual(
+            list(ArtifactFeedback.objects.order_by("index").values_list("pk", "page")),
+            [(parent.pk, str(parent.index + 1)) for parent in parents],
+        )
+        self.assertFalse(any(child._state.adding for child in children))
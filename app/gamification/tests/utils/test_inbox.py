@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual
+from app.gamification.models.membership import Membership
+from app.gamification.models.registration import Registration
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.inbox import user_review_inbox
+
+
+class UserReviewInboxTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.course = Course.objects.create(course_number="17-000", course_name="Course")
+        self.reviewer = CustomUser.objects.create_user(andrew_id="reviewer", email="reviewer@example.com")
+        self.registration = Registration.objects.create(user=self.reviewer, course=self.course)
+        self.assignment = Assignment.objects.create(course=self.course, assignment_name="Assignment")
+        self.survey = FeedbackSurvey.objects.create(
+            assignment=self.assignment, date_released=now - timedelta(days=1), date_due=now + timedelta(days=1)
+        )
+        self.reviews = []
+        for index in range(5):
+            student = CustomUser.objects.create_user(andrew_id=f"student{index}", email=f"student{index}@example.com")
+            individual = Individual.objects.create(course=self.course)
+            Membership.objects.create(
+                student=Registration.objects.create(user=student, course=self.course), entity=individual
+            )
+            artifact = Artifact.objects.create(assignment=self.assignment, entity=individual)
+            self.reviews.append(ArtifactReview.objects.create(artifact=artifact, user=self.registration))
+
+    def test_inbox_uses_a_single_query(self):
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            inbox = user_review_inbox(self.reviewer.id)
+
+        # Assert
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([row["reviewing"] for row in inbox], [f"student{index}" for index in range(5)])
+        self.assertEqual(inbox[0]["course_number"], "17-000")
+        self.assertEqual(inbox[0]["assignment_type"], Assignment.AssigmentType.Individual)
+
+    def test_completed_and_unreleased_reviews_are_hidden(self):
+        # Arrange
+        self.reviews[0].status = ArtifactReview.ArtifactReviewType.COMPLETED
+        self.reviews[0].save()
+
+        # Act
+        inbox = user_review_inbox(self.reviewer.id)
+        unreleased = user_review_inbox(self.reviewer.id, now=timezone.now() - timedelta(days=2))
+
+        # Assert
+        self.assertEqual(len(inbox), 4)
+        self.assertEqual(unreleased, [])
+
+    def test_inbox_does_not_write(self):
+        # Arrange
+        self.survey.date_due = timezone.now() - timedelta(hours=1)
+        self.survey.save()
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            inbox = user_review_inbox(self.reviewer.id)
+
+        # Assert
+        self.assertTrue(all(query["sql"].startswith("SELECT") for query in queries.captured_queries))
+        self.assertTrue(all(row["status"] == ArtifactReview.ArtifactReviewType.INCOMPLETE for row in inbox))
@@ -0,0 +1,257 @@
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from app.gamification.benchmarks.ipsatization import pandas_ipsatization
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual
+from app.gamification.models.ipsatization_result import IpsatizationResult
+from app.gamification.models.registration import Registration
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.ipsatization import (
+    ipsatization_scores,
+    ipsatize,
+    normalize_scores,
+    review_score_matrix,
+    reviews_changed,
+)
+from app.gamification.utils.review_assign import delete_artifact_reviews
+
+
+class IpsatizeTest(SimpleTestCase):
+    def test_matches_pandas_reference(self):
+        # Arrange
+        rng = np.random.default_rng(0)
+        data = rng.random((30, 12))
+        mask = rng.random(data.shape) < 0.6
+        mask[:, 0] = False
+        data[3] = 0.7  # a reviewer giving every artifact the same score
+        matrix = np.where(mask, np.nan, data)
+
+        # Act
+        scores = ipsatize(np.ma.masked_array(data, mask), 100, 80)
+
+        # Assert
+        np.testing.assert_allclose(scores, pandas_ipsatization(matrix.tolist(), 100, 80))
+
+    def test_reviewers_without_reviews_are_ignored(self):
+        # Arrange
+        data = np.array([[0.2, 0.8], [0.0, 0.0]])
+        mask = np.array([[False, False], [True, True]])
+
+        # Act
+        scores = ipsatize(np.ma.masked_array(data, mask), 100, 80)
+
+        # Assert
+        np.testing.assert_allclose(scores, [80, 100])
+
+
+class ReviewScoreMatrixTest(TestCase):
+    def test_matrix_of_submitted_reviews(self):
+        # Arrange
+        course = Course.objects.create(course_name="Course")
+        assignment = Assignment.objects.create(course=course, assignment_name="Assignment")
+        artifacts = [
+            Artifact.objects.create(assignment=assignment, entity=Individual.objects.create(course=course))
+            for _ in range(3)
+        ]
+        registrations = [
+            Registration.objects.create(
+                user=CustomUser.objects.create_user(andrew_id=f"user{index}", email=f"user{index}@example.com"),
+                course=course,
+            )
+            for index in range(2)
+        ]
+        ArtifactReview.objects.create(
+            artifact=artifacts[2],
+            user=registrations[0],
+            status=ArtifactReview.ArtifactReviewType.COMPLETED,
+            artifact_review_score=30,
+            max_artifact_review_score=100,
+        )
+        ArtifactReview.objects.create(
+            artifact=artifacts[0],
+            user=registrations[1],
+            status=ArtifactReview.ArtifactReviewType.COMPLETED,
+            artifact_review_score=50,
+            max_artifact_review_score=200,
+        )
+        ArtifactReview.objects.create(artifact=artifacts[1], user=registrations[1])
+
+        # Act
+        reviewer_ids, artifact_ids, scores = review_score_matrix(assignment.id)
+
+        # Assert
+        self.assertEqual(reviewer_ids, [registration.id for registration in registrations])
+        self.assertEqual(artifact_ids, [artifact.id for artifact in artifacts])
+        self.assertEqual(scores.tolist(), [[None, None, 0.3], [0.25, None, None]])
+
+
+class IpsatizationResultTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(course_name="Course")
+        self.assignment = Assignment.objects.create(course=course, assignment_name="Assignment")
+        self.artifacts = [
+            Artifact.objects.create(assignment=self.assignment, entity=Individual.objects.create(course=course))
+            for _ in range(4)
+        ]
+        self.registrations = [
+            Registration.objects.create(
+                user=CustomUser.objects.create_user(andrew_id=f"user{index}", email=f"user{index}@example.com"),
+                course=course,
+            )
+            for index in range(3)
+        ]
+        for index, registration in enumerate(self.registrations):
+            for offset in range(3):
+                ArtifactReview.objects.create(
+                    artifact=self.artifacts[(index + offset) % 4],
+                    user=registration,
+                    status=ArtifactReview.ArtifactReviewType.COMPLETED,
+                    artifact_review_score=(index * 7 + offset * 13) % 10,
+                    max_artifact_review_score=10,
+                )
+
+    def expected_scores(self):
+        _, artifact_ids, scores = review_score_matrix(self.assignment.id)
+        return dict(zip(artifact_ids, ipsatize(scores, 100, 80).tolist()))
+
+    def test_result_is_stored_and_reused(self):
+        # Arrange
+        ipsatization_scores(self.assignment, 100, 80)
+
+        # Act
+        with self.assertNumQueries(2):
+            scores = ipsatization_scores(self.assignment, 100, 80)
+
+        # Assert
+        self.assertEqual(scores.keys(), self.expected_scores().keys())
+        np.testing.assert_allclose(list(scores.values()), list(self.expected_scores().values()))
+
+    def test_changed_reviewer_is_updated_incrementally(self):
+        # Arrange
+        ipsatization_scores(self.assignment, 100, 80)
+        review = ArtifactReview.objects.filter(user=self.registrations[1]).first()
+        review.artifact_review_score = 10
+        review.save()
+        ArtifactReview.objects.filter(user=self.registrations[2], artifact=self.artifacts[3]).update(
+            status=ArtifactReview.ArtifactReviewType.INCOMPLETE
+        )
+
+        # Act
+        reviews_changed(self.assignment.id, [self.registrations[1].id, self.registrations[2].id])
+        self.assignment.refresh_from_db()
+
+        # Assert
+        result = IpsatizationResult.objects.get(assignment=self.assignment)
+        self.assertEqual(result.review_version, self.assignment.review_version)
+        with self.assertNumQueries(2):
+            scores = ipsatization_scores(self.assignment, 100, 80)
+        np.testing.assert_allclose(list(scores.values()), list(self.expected_scores().values()))
+
+    def test_deleted_review_is_removed_from_result(self):
+        # Arrange
+        ipsatization_scores(self.assignment, 100, 80)
+
+        # Act
+        delete_artifact_reviews(ArtifactReview.objects.filter(user=self.registrations[0], artifact=self.artifacts[0]))
+        self.assignment.refresh_from_db()
+
+        # Assert
+        result = IpsatizationResult.objects.get(assignment=self.assignment)
+        self.assertEqual(result.review_version, self.assignment.review_version)
+        scores = ipsatization_scores(self.assignment, 100, 80)
+        np.testing.assert_allclose(list(scores.values()), list(self.expected_scores().values()))
+
+    def test_other_bounds_are_not_stored(self):
+        # Arrange
+        ipsatization_scores(self.assignment, 100, 80)
+        stored = IpsatizationResult.objects.get(assignment=self.assignment)
+
+        # Act
+        scores = ipsatization_scores(self.assignment, 50, 0)
+
+        # Assert
+        result = IpsatizationResult.objects.get(assignment=self.assignment)
+        self.assertEqual((result.ipsatization_max, result.ipsatization_min), (100, 80))
+        self.assertEqual(result.scores, stored.scores)
+        _, _, matrix = review_score_matrix(self.assignment.id)
+        np.testing.assert_allclose(list(scores.values()), ipsatize(matrix, 50, 0))
+
+    def test_other_bounds_are_computed_without_storing(self):
+        # Act
+        scores = ipsatization_scores(self.assignment, 50, 0)
+
+        # Assert
+        self.assertFalse(IpsatizationResult.objects.filter(assignment=self.assignment).exists())
+        _, _, matrix = review_score_matrix(self.assignment.id)
+        np.testing.assert_allclose(list(scores.values()), ipsatize(matrix, 50, 0))
+
+    def test_change_without_reviewers_drops_result(self):
+        # Arrange
+        ipsatization_scores(self.assignment, 100, 80)
+
+        # Act
+        reviews_changed(self.assignment.id)
+
+        # Assert
+        self.assertFalse(IpsatizationResult.objects.filter(assignment=self.assignment).exists())
+
+
+class NormalizeScoresTest(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(course_name="Course")
+        registrations = [
+            Registration.objects.create(
+                user=CustomUser.objects.create_user(andrew_id=f"user{index}", email=f"user{index}@example.com"),
+                course=self.course,
+            )
+            for index in range(3)
+        ]
+        self.assignments = []
+        for number in range(2):
+            assignment = Assignment.objects.create(course=self.course, assignment_name=f"Assignment {number}")
+            for index, registration in enumerate(registrations):
+                artifact = Artifact.objects.create(
+                    assignment=assignment, entity=Individual.objects.create(course=self.course)
+                )
+                for reviewer in registrations[:index] + registrations[index + 1 :]:
+                    ArtifactReview.objects.create(
+                        artifact=artifact,
+                        user=reviewer,
+                        status=ArtifactReview.ArtifactReviewType.COMPLETED,
+                        artifact_review_score=(number + index * 3 + reviewer.id) % 7,
+                        max_artifact_review_score=7,
+                    )
+            self.assignments.append(assignment)
+        other_course = Course.objects.create(course_name="Other course")
+        self.other_assignment = Assignment.objects.create(course=other_course, assignment_name="Other")
+
+    def test_course_results_are_stored(self):
+        # Act
+        with self.assertNumQueries(9):
+            stored = normalize_scores([self.course.id])
+
+        # Assert
+        self.assertEqual(stored, 2)
+        self.assertFalse(IpsatizationResult.objects.filter(assignment=self.other_assignment).exists())
+        for assignment in self.assignments:
+            _, artifact_ids, scores = review_score_matrix(assignment.id)
+            with self.assertNumQueries(2):
+                results = ipsatization_scores(assignment, 100, 80)
+            self.assertEqual(list(results), artifact_ids)
+            np.testing.assert_allclose(list(results.values()), ipsatize(scores, 100, 80))
+
+    def test_current_results_are_skipped(self):
+        # Arrange
+        normalize_scores([self.course.id])
+        reviews_changed(self.assignments[1].id)
+
+        # Act
+        stored = normalize_scores([self.course.id])
+
+        # Assert
+        self.assertEqual(stored, 1)
+        self.assertEqual(normalize_scores([self.course.id], force=True), 2)
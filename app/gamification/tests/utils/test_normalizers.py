@@ -0,0 +1,106 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from app.gamification.utils.ipsatization import ipsatize
+from app.gamification.utils.normalizers import (
+    NORMALIZERS,
+    normalize,
+    percentile_means,
+    shrunk_means,
+    trimmed_means,
+    z_score_means,
+)
+
+
+def reviews_of(scores, axis):
+    """
+    The reviewed values of each row (axis=1) or column (axis=0) of a masked matrix.
+    """
+    lines = scores if axis == 1 else scores.T
+    return [line.compressed().tolist() for line in lines]
+
+
+class NormalizersTest(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        data = np.round(rng.random((12, 9)), 1)  # rounded so that reviewers give tied scores
+        mask = rng.random(data.shape) < 0.5
+        mask[:, 0] = False
+        mask[:, -1] = True  # an artifact nobody reviewed
+        data[4] = 0.6  # a reviewer giving every artifact the same score
+        self.scores = np.ma.masked_array(data, mask)
+
+    def test_z_score_means(self):
+        # Arrange
+        rows = reviews_of(self.scores, axis=1)
+        expected = []
+        for column in range(self.scores.shape[1]):
+            values = [
+                (self.scores[row, column] - np.mean(reviews)) / np.std(reviews) if np.std(reviews) else 0
+                for row, reviews in enumerate(rows)
+                if not self.scores.mask[row, column]
+            ]
+            expected.append(np.mean(values) if values else np.nan)
+
+        # Act
+        means = z_score_means(self.scores)
+
+        # Assert
+        np.testing.assert_allclose(means, expected)
+
+    def test_percentile_means(self):
+        # Arrange
+        rows = reviews_of(self.scores, axis=1)
+        expected = []
+        for column in range(self.scores.shape[1]):
+            values = []
+            for row, reviews in enumerate(rows):
+                if not self.scores.mask[row, column]:
+                    score = self.scores[row, column]
+                    below = sum(value < score for value in reviews)
+                    values.append((below + 0.5 * reviews.count(score)) / len(reviews))
+            expected.append(np.mean(values) if values else np.nan)
+
+        # Act
+        means = percentile_means(self.scores)
+
+        # Assert
+        np.testing.assert_allclose(means, expected)
+
+    def test_trimmed_means(self):
+        # Arrange
+        expected = []
+        for reviews in reviews_of(self.scores, axis=0):
+            cut = int(len(reviews) * 0.25)
+            kept = sorted(reviews)[cut : len(reviews) - cut]
+            expected.append(np.mean(kept) if kept else np.nan)
+
+        # Act
+        means = trimmed_means(self.scores, proportion=0.25)
+
+        # Assert
+        np.testing.assert_allclose(means, expected)
+
+    def test_shrunk_means_move_toward_the_mean_of_all_artifacts(self):
+        # Act
+        means = shrunk_means(self.scores)
+
+        # Assert
+        raw = self.scores.mean(axis=0)
+        prior = raw[:-1].mean()
+        self.assertTrue(np.isnan(means[-1]))
+        self.assertTrue(np.all(np.abs(means[:-1] - prior) <= np.abs(raw[:-1] - prior) + 1e-12))
+
+    def test_normalize(self):
+        for method in NORMALIZERS:
+            with self.subTest(method=method):
+                # Act
+                scores = normalize(self.scores, method, 100, 80)
+
+                # Assert
+                if method == "ipsatization":
+                    np.testing.assert_allclose(scores, ipsatize(self.scores, 100, 80))
+                else:
+                    self.assertTrue(np.isnan(scores[-1]))
+                self.assertAlmostEqual(np.nanmin(scores), 80)
+                self.assertAlmostEqual(np.nanmax(scores), 100)
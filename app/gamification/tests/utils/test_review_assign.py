@@ -0,0 +1,316 @@
+from collections import Counter
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual, Team
+from app.gamification.models.membership import Membership
+from app.gamification.models.registration import Registration
+from app.gamification.models.reviewer_load import ReviewerLoad
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.review_assign import (
+    REVIEW_ASSIGN_STRATEGIES,
+    adjust_reviewer_load,
+    assign_late_artifact,
+    assign_reviews,
+    assign_team_artifact,
+    delete_artifact_reviews,
+    rebuild_reviewer_loads,
+)
+
+
+class ReviewAssignStrategyTest(TestCase):
+    def setUp(self):
+        # 30 individuals and 10 teams of 3, registration ids 1..30
+        self.individual_reviewers = [(i, 100 + i) for i in range(1, 31)]
+        self.individual_artifacts = [(1000 + i, 100 + i) for i in range(1, 31)]
+        self.team_reviewers = [(i, 200 + (i - 1) // 3) for i in range(1, 31)]
+        self.team_artifacts = [(2000 + t, 200 + t) for t in range(10)]
+
+    def assertValidPlan(self, plan, reviewers, artifacts, min_reviewers, max_spread):
+        entity_of = dict(reviewers)
+        artifact_entity = dict(artifacts)
+        self.assertEqual(len(plan), len(set(plan)))
+        for artifact_id, registration_id in plan:
+            self.assertNotEqual(entity_of[registration_id], artifact_entity[artifact_id])
+        reviewers_per_artifact = Counter(artifact_id for artifact_id, _ in plan)
+        for artifact_id, _ in artifacts:
+            self.assertEqual(reviewers_per_artifact[artifact_id], min_reviewers)
+        loads = Counter(registration_id for _, registration_id in plan)
+        loads = [loads[registration_id] for registration_id, _ in reviewers]
+        self.assertLessEqual(max(loads) - min(loads), max_spread)
+
+    def test_every_policy_is_registered(self):
+        # Act
+        policies = set(REVIEW_ASSIGN_STRATEGIES)
+
+        # Assert
+        self.assertEqual(policies, set(Assignment.ReviewerAssignPolicy.values))
+
+    def test_individual_assignment(self):
+        for policy, strategy in REVIEW_ASSIGN_STRATEGIES.items():
+            with self.subTest(policy=policy):
+                # Act
+                plan = strategy(self.individual_reviewers, self.individual_artifacts, 3, seed=7)
+
+                # Assert
+                self.assertValidPlan(plan, self.individual_reviewers, self.individual_artifacts, 3, 1)
+
+    def test_team_assignment(self):
+        for policy, strategy in REVIEW_ASSIGN_STRATEGIES.items():
+            with self.subTest(policy=policy):
+                # Act
+                plan = strategy(self.team_reviewers, self.team_artifacts, 4, seed=7)
+
+                # Assert
+                self.assertValidPlan(plan, self.team_reviewers, self.team_artifacts, 4, 1)
+
+    def test_min_reviewers_capped_by_eligible_reviewers(self):
+        # Arrange
+        reviewers = [(1, 11), (2, 12), (3, 13)]
+        artifacts = [(21, 11), (22, 12), (23, 13)]
+
+        for policy, strategy in REVIEW_ASSIGN_STRATEGIES.items():
+            with self.subTest(policy=policy):
+                # Act
+                plan = strategy(reviewers, artifacts, 5, seed=7)
+
+                # Assert
+                self.assertValidPlan(plan, reviewers, artifacts, 2, 0)
+
+    def test_uneven_teams(self):
+        # Arrange
+        cases = [
+            ([(1, 1), (2, 1), (3, 2)], [(101, 1), (102, 2)], 1),
+            ([(1, 1), (2, 1), (3, 1), (4, 2), (5, 3)], [(101, 1), (102, 2), (103, 3)], 2),
+        ]
+
+        for reviewers, artifacts, min_reviewers in cases:
+            for policy, strategy in REVIEW_ASSIGN_STRATEGIES.items():
+                with self.subTest(policy=policy, reviewers=reviewers):
+                    # Act
+                    plan = strategy(reviewers, artifacts, min_reviewers, seed=7)
+
+                    # Assert
+                    self.assertValidPlan(plan, reviewers, artifacts, min_reviewers, 2)
+
+    def test_random_policy_is_reproducible(self):
+        # Arrange
+        strategy = REVIEW_ASSIGN_STRATEGIES[Assignment.ReviewerAssignPolicy.B]
+
+        # Act
+        first = strategy(self.individual_reviewers, self.individual_artifacts, 3, seed=42)
+        second = strategy(self.individual_reviewers, self.individual_artifacts, 3, seed=42)
+
+        # Assert
+        self.assertEqual(first, second)
+
+
+class DeleteArtifactReviewsTest(TestCase):
+    def test_counters_follow_deleted_reviews(self):
+        # Arrange
+        course = Course.objects.create(course_name="Course")
+        assignment = Assignment.objects.create(course=course, assignment_name="Assignment")
+        artifacts = [
+            Artifact.objects.create(assignment=assignment, entity=Individual.objects.create(course=course))
+            for _ in range(2)
+        ]
+        registrations = [
+            Registration.objects.create(
+                user=CustomUser.objects.create_user(andrew_id=f"user{index}", email=f"user{index}@example.com"),
+                course=course,
+            )
+            for index in range(2)
+        ]
+        completed = ArtifactReview.ArtifactReviewType.COMPLETED
+        for artifact, registration, status in [
+            (artifacts[0], registrations[0], completed),
+            (artifacts[1], registrations[0], ArtifactReview.ArtifactReviewType.INCOMPLETE),
+            (artifacts[0], registrations[1], completed),
+        ]:
+            ArtifactReview.objects.create(artifact=artifact, user=registration, status=status)
+        Artifact.objects.filter(id=artifacts[0].id).update(completed_review_count=2)
+        rebuild_reviewer_loads(assignment)
+
+        # Act
+        deleted = delete_artifact_reviews(ArtifactReview.objects.filter(user=registrations[0]))
+
+        # Assert
+        self.assertEqual(deleted, 2)
+        self.assertEqual(
+            list(Artifact.objects.order_by("id").values_list("completed_review_count", flat=True)), [1, 0]
+        )
+        self.assertEqual(
+            dict(ReviewerLoad.objects.filter(assignment=assignment).values_list("registration_id", "review_count")),
+            {registrations[0].id: 0, registrations[1].id: 1},
+        )
+
+
+class ReviewerLoadTest(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(course_name="Course")
+        self.assignment = Assignment.objects.create(course=self.course, assignment_name="Assignment", min_reviewers=2)
+        self.registrations = [
+            Registration.objects.create(
+                user=CustomUser.objects.create_user(andrew_id=f"user{index}", email=f"user{index}@example.com"),
+                course=self.course,
+            )
+            for index in range(6)
+        ]
+
+    def loads(self):
+        return dict(
+            ReviewerLoad.objects.filter(assignment=self.assignment).values_list("registration_id", "review_count")
+        )
+
+    def submit(self, registrations, entity=None):
+        entity = entity or Individual.objects.create(course=self.course)
+        for registration in registrations:
+            Membership.objects.create(student=registration, entity=entity)
+        return Artifact.objects.create(assignment=self.assignment, entity=entity)
+
+    def test_late_artifact_goes_to_least_loaded_reviewers_outside_its_entity(self):
+        # Arrange
+        counts = [5, 1, 0, 2, 3]
+        ReviewerLoad.objects.bulk_create(
+            [
+                ReviewerLoad(assignment=self.assignment, registration=registration, review_count=count)
+                for registration, count in zip(self.registrations, counts)
+            ]
+        )
+        uploader, teammate = self.registrations[5], self.registrations[2]
+        artifact = self.submit([uploader, teammate], Team.objects.create(course=self.course, name="Team"))
+
+        # Act
+        created = assign_late_artifact(artifact)
+
+        # Assert
+        self.assertEqual(created, 2)
+        self.assertEqual(
+            set(ArtifactReview.objects.filter(artifact=artifact).values_list("user_id", flat=True)),
+            {self.registrations[1].id, self.registrations[3].id},
+        )
+        self.assertEqual(
+            self.loads(),
+            {
+                self.registrations[0].id: 5,
+                self.registrations[1].id: 2,
+                teammate.id: 0,
+                self.registrations[3].id: 3,
+                self.registrations[4].id: 3,
+                uploader.id: 0,
+            },
+        )
+
+    def test_late_artifact_tops_up_to_min_reviewers(self):
+        # Arrange
+        for registration in self.registrations[:4]:
+            self.submit([registration])
+        assign_reviews(self.assignment)
+        artifact = self.submit([self.registrations[4]])
+        ArtifactReview.objects.create(artifact=artifact, user=self.registrations[0])
+        adjust_reviewer_load(self.assignment.id, [self.registrations[0].id], 1)
+
+        # Act
+        created = assign_late_artifact(artifact)
+        again = assign_late_artifact(artifact)
+
+        # Assert
+        self.assertEqual((created, again), (1, 0))
+        self.assertEqual(ArtifactReview.objects.filter(artifact=artifact).count(), 2)
+        self.assertFalse(ArtifactReview.objects.filter(artifact=artifact, user=self.registrations[4]).exists())
+
+    def test_index_stays_consistent_with_rebuild(self):
+        # Arrange
+        for registration in self.registrations[:4]:
+            self.submit([registration])
+        assign_reviews(self.assignment)
+        late_artifact = self.submit([self.registrations[4]])
+
+        # Act
+        assign_late_artifact(late_artifact)
+        delete_artifact_reviews(ArtifactReview.objects.filter(user=self.registrations[1]))
+        maintained = self.loads()
+        rebuild_reviewer_loads(self.assignment, list(maintained))
+
+        # Assert
+        reviews = ArtifactReview.objects.filter(artifact__assignment=self.assignment)
+        self.assertEqual(sum(maintained.values()), reviews.count())
+        self.assertEqual(maintained[self.registrations[1].id], 0)
+        self.assertEqual(self.loads(), maintained)
+
+    def test_adjust_only_extends_a_built_index(self):
+        # Arrange
+        first, second = self.registrations[:2]
+
+        # Act
+        adjust_reviewer_load(self.assignment.id, [first.id], 1)
+        before_build = self.loads()
+        rebuild_reviewer_loads(self.assignment, [first.id])
+        adjust_reviewer_load(self.assignment.id, [first.id, second.id], 1)
+        adjust_reviewer_load(self.assignment.id, [first.id], -1)
+
+        # Assert
+        self.assertEqual(before_build, {})
+        self.assertEqual(self.loads(), {first.id: 0, second.id: 1})
+
+
+class AssignTeamArtifactTest(TestCase):
+    def build_course(self, students):
+        course = Course.objects.create(course_name=f"Course {students}")
+        assignment = Assignment.objects.create(
+            course=course, assignment_name="Assignment", assignment_type=Assignment.AssigmentType.Team
+        )
+        team = Team.objects.create(course=course, name="Team")
+        registrations = [
+            Registration.objects.create(
+                user=CustomUser.objects.create_user(
+                    andrew_id=f"user{students}_{index}", email=f"user{students}_{index}@example.com"
+                ),
+                course=course,
+            )
+            for index in range(students)
+        ]
+        for registration in registrations[:2]:
+            Membership.objects.create(student=registration, entity=team)
+        staff = CustomUser.objects.create_user(
+            andrew_id=f"staff{students}", email=f"staff{students}@example.com", is_staff=True
+        )
+        Registration.objects.create(user=staff, course=course)
+        artifact = Artifact.objects.create(assignment=assignment, entity=team)
+        return registrations, artifact
+
+    def test_everyone_outside_the_team_reviews_once(self):
+        # Arrange
+        registrations, artifact = self.build_course(6)
+
+        # Act
+        created = assign_team_artifact(artifact)
+        again = assign_team_artifact(artifact)
+
+        # Assert
+        self.assertEqual((created, again), (4, 0))
+        self.assertEqual(
+            sorted(ArtifactReview.objects.filter(artifact=artifact).values_list("user_id", flat=True)),
+            [registration.id for registration in registrations[2:]],
+        )
+
+    def test_query_count_does_not_grow_with_the_course(self):
+        # Arrange
+        query_counts = []
+        for students in [5, 40]:
+            _, artifact = self.build_course(students)
+            artifact = Artifact.objects.get(id=artifact.id)
+
+            # Act
+            with CaptureQueriesContext(connection) as queries:
+                assign_team_artifact(artifact)
+            query_counts.append(len(queries))
+
+        # Assert
+        self.assertEqual(query_counts[0], query_counts[1])
@@ -0,0 +1,58 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Team
+from app.gamification.models.membership import Membership
+from app.gamification.models.registration import Registration
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.review_matrix import review_matrix_page, stream_review_matrix
+
+
+class ReviewMatrixTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(course_number="17-000", course_name="Course")
+        self.assignment = Assignment.objects.create(
+            course=course, assignment_name="Assignment", assignment_type=Assignment.AssigmentType.Team
+        )
+        teams = [Team.objects.create(course=course, name=f"Team {index}") for index in range(3)]
+        registrations = []
+        for index in range(6):
+            user = CustomUser.objects.create_user(andrew_id=f"student{index}", email=f"student{index}@example.com")
+            registration = Registration.objects.create(user=user, course=course)
+            Membership.objects.create(student=registration, entity=teams[index % 3])
+            registrations.append(registration)
+        for team in teams:
+            artifact = Artifact.objects.create(assignment=self.assignment, entity=team)
+            for registration in registrations:
+                if registration.membership_set.get().entity_id != team.id:
+                    ArtifactReview.objects.create(artifact=artifact, user=registration)
+
+    def test_keyset_pages_cover_every_review_once(self):
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            first, cursor = review_matrix_page(self.assignment.id, limit=5)
+        rest, last_cursor = review_matrix_page(self.assignment.id, after=cursor, limit=100)
+
+        # Assert
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(first), 5)
+        self.assertIsNone(last_cursor)
+        self.assertEqual(
+            [row["id"] for row in first + rest],
+            list(ArtifactReview.objects.order_by("id").values_list("id", flat=True)),
+        )
+        self.assertTrue(first[0]["reviewing"].startswith("Team"))
+        self.assertTrue(first[0]["reviewer"].startswith("student"))
+
+    def test_stream_is_json_lines(self):
+        # Act
+        lines = list(stream_review_matrix(self.assignment.id))
+
+        # Assert
+        self.assertEqual(len(lines), ArtifactReview.objects.count())
+        self.assertTrue(all(line.endswith("\n") for line in lines))
@@ -0,0 +1,95 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from app.gamification.models.answer import Answer
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual
+from app.gamification.models.option_choice import OptionChoice
+from app.gamification.models.question import Question
+from app.gamification.models.registration import Registration
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.survey_section import SurveySection
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.scoring import rescore_assignment, score_answers
+
+
+class ScoringTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        course = Course.objects.create(course_name="Course")
+        self.assignment = Assignment.objects.create(course=course, assignment_name="Assignment")
+        section = SurveySection.objects.create(survey=FeedbackSurvey.objects.create(assignment=self.assignment))
+        self.scale = Question.objects.create(
+            section=section, question_type=Question.QuestionType.SCALEMULTIPLECHOICE, number_of_scale=5
+        )
+        self.negative_scale = Question.objects.create(
+            section=section,
+            question_type=Question.QuestionType.SCALEMULTIPLECHOICE,
+            number_of_scale=5,
+            phrased_positively=False,
+        )
+        self.number = Question.objects.create(
+            section=section, question_type=Question.QuestionType.NUMBER, min=0, max=10
+        )
+        self.choice = Question.objects.create(section=section, question_type=Question.QuestionType.MULTIPLECHOICE)
+        self.text = Question.objects.create(section=section, question_type=Question.QuestionType.TEXTAREA)
+        options = {self.scale: [""], self.negative_scale: [""], self.number: [""], self.text: [""]}
+        options[self.choice] = ["a", "b", "c"]
+        for question, texts in options.items():
+            question.option_list = [OptionChoice.objects.create(question=question, text=text) for text in texts]
+        self.questions = {question.pk: question for question in options}
+
+    def test_answers_are_normalized_per_question(self):
+        # Arrange
+        answers = [
+            (1, self.scale.pk, self.scale.option_list[0].pk, "agree"),
+            (1, self.negative_scale.pk, self.negative_scale.option_list[0].pk, "agree"),
+            (1, self.number.pk, self.number.option_list[0].pk, "8"),
+            (1, self.choice.pk, self.choice.option_list[1].pk, "b"),
+            (1, self.text.pk, self.text.option_list[0].pk, "not scored"),
+            (2, self.number.pk, self.number.option_list[0].pk, "20"),
+            (3, self.text.pk, self.text.option_list[0].pk, "not scored"),
+        ]
+
+        # Act
+        scores = score_answers(self.questions, answers)
+
+        # Assert
+        self.assertEqual(scores, {1: (75 + 25 + 80 + 50, 400), 2: (100, 100)})
+
+    def test_rescore_assignment(self):
+        # Arrange
+        artifact = Artifact.objects.create(
+            assignment=self.assignment, entity=Individual.objects.create(course=self.assignment.course)
+        )
+        reviews = []
+        for index, status in enumerate(
+            [ArtifactReview.ArtifactReviewType.COMPLETED, ArtifactReview.ArtifactReviewType.INCOMPLETE]
+        ):
+            user = CustomUser.objects.create_user(andrew_id=f"reviewer{index}", email=f"reviewer{index}@example.com")
+            review = ArtifactReview.objects.create(
+                artifact=artifact,
+                user=Registration.objects.create(user=user, course=self.assignment.course),
+                status=status,
+            )
+            Answer.objects.create(
+                artifact_review=review, option_choice=self.scale.option_list[0], answer_text="neutral"
+            )
+            reviews.append(review)
+
+        # Act
+        rescored = rescore_assignment(self.assignment)
+
+        # Assert
+        self.assertEqual(rescored, 1)
+        self.assertEqual(
+            list(
+                ArtifactReview.objects.filter(id__in=[review.id for review in reviews])
+                .order_by("id")
+                .values_list("artifact_review_score", "max_artifact_review_score")
+            ),
+            [(50, 100), (None, None)],
+        )
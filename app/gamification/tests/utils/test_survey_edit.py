@@ -0,0 +1,253 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual
+from app.gamification.models.option_choice import OptionChoice
+from app.gamification.models.question import Question
+from app.gamification.models.registration import Registration
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.survey_section import SurveySection
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.survey_edit import apply_survey_edit, clone_survey_tree, survey_is_locked
+from app.gamification.utils.survey_tree import freeze_survey
+
+
+def question_data(text, question_type=Question.QuestionType.TEXTAREA, option_choices=(), pk=None):
+    return {
+        "pk": pk,
+        "text": text,
+        "is_required": False,
+        "question_type": question_type,
+        "phrased_positively": True,
+        "gamified": False,
+        "number_of_scale": 5,
+        "number_of_text": 1,
+        "option_choices": list(option_choices),
+    }
+
+
+class ApplySurveyEditTest(TestCase):
+    def setUp(self):
+        assignment = Assignment.objects.create(
+            course=Course.objects.create(course_name="Course"), assignment_name="Assignment"
+        )
+        self.survey = FeedbackSurvey.objects.create(assignment=assignment)
+        apply_survey_edit(
+            self.survey,
+            [
+                {
+                    "title": "First",
+                    "is_required": False,
+                    "questions": [
+                        question_data("Text"),
+                        question_data(
+                            "Choice",
+                            Question.QuestionType.MULTIPLECHOICE,
+                            [{"text": "Yes"}, {"text": "No"}],
+                        ),
+                    ],
+                },
+                {"title": "Second", "is_required": True, "questions": [question_data("Other")]},
+            ],
+        )
+
+    def current(self):
+        return [
+            {
+                "pk": section.pk,
+                "title": section.title,
+                "is_required": section.is_required,
+                "questions": [
+                    {
+                        **question_data(question.text, question.question_type, pk=question.pk),
+                        "option_choices": [
+                            {"pk": option_choice.pk, "text": option_choice.text}
+                            for option_choice in OptionChoice.objects.filter(question=question).order_by("pk")
+                        ],
+                    }
+                    for question in Question.objects.filter(section=section).order_by("pk")
+                ],
+            }
+            for section in SurveySection.objects.filter(survey=self.survey).order_by("pk")
+        ]
+
+    def test_created_survey(self):
+        # Act
+        sections = self.current()
+
+        # Assert
+        self.assertEqual([section["title"] for section in sections], ["First", "Second"])
+        self.assertEqual([question["text"] for question in sections[0]["questions"]], ["Text", "Choice"])
+        self.assertEqual([option["text"] for option in sections[0]["questions"][0]["option_choices"]], [""])
+        self.assertEqual([option["text"] for option in sections[0]["questions"][1]["option_choices"]], ["Yes", "No"])
+
+    def test_edit_keeps_matched_rows(self):
+        # Arrange
+        sections = self.current()
+        sections[0]["title"] = "Renamed"
+        sections[0]["questions"][1]["option_choices"][1]["text"] = "Maybe"
+        sections[0]["questions"][1]["option_choices"].append({"text": "No"})
+        del sections[0]["questions"][0]
+        sections[1]["questions"].append(question_data("Appended"))
+        before = {question.pk for question in Question.objects.filter(section__survey=self.survey)}
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            apply_survey_edit(self.survey, sections)
+        after = self.current()
+
+        # Assert
+        self.assertLessEqual(len(queries), 20)
+        self.assertEqual([section["pk"] for section in after], [section["pk"] for section in sections])
+        self.assertEqual(after[0]["title"], "Renamed")
+        self.assertEqual(after[0]["questions"][0]["pk"], sections[0]["questions"][0]["pk"])
+        self.assertEqual(
+            [option["text"] for option in after[0]["questions"][0]["option_choices"]], ["Yes", "Maybe", "No"]
+        )
+        self.assertEqual([question["text"] for question in after[1]["questions"]], ["Other", "Appended"])
+        self.assertEqual(len(before & {question["pk"] for section in after for question in section["questions"]}), 2)
+
+    def test_reordered_questions_are_recreated_in_order(self):
+        # Arrange
+        sections = self.current()
+        sections[0]["questions"].reverse()
+
+        # Act
+        apply_survey_edit(self.survey, sections)
+        after = self.current()
+
+        # Assert
+        self.assertEqual([question["text"] for question in after[0]["questions"]], ["Choice", "Text"])
+        self.assertEqual([option["text"] for option in after[0]["questions"][0]["option_choices"]], ["Yes", "No"])
+        self.assertEqual([option["text"] for option in after[0]["questions"][1]["option_choices"]], [""])
+
+    def test_released_survey_is_not_edited(self):
+        # Arrange
+        freeze_survey(self.survey)
+        FeedbackSurvey.objects.filter(id=self.survey.id).update(is_released=True)
+        snapshot = FeedbackSurvey.objects.get(id=self.survey.id).snapshot
+        sections = self.current()
+        sections[0]["questions"][0]["text"] = "Edited"
+
+        # Act
+        response = self.client.patch(
+            f"/api/assignments/{self.survey.assignment_id}/surveys/",
+            {"survey_info": {"pk": self.survey.pk, "sections": sections}},
+            content_type="application/json",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(FeedbackSurvey.objects.get(id=self.survey.id).snapshot, snapshot)
+        self.assertEqual(self.current()[0]["questions"][0]["text"], "Text")
+
+    def test_released_survey_with_completed_review_is_locked(self):
+        # Arrange
+        freeze_survey(self.survey)
+        FeedbackSurvey.objects.filter(id=self.survey.id).update(is_released=True)
+        course = self.survey.assignment.course
+        ArtifactReview.objects.create(
+            artifact=Artifact.objects.create(
+                assignment=self.survey.assignment, entity=Individual.objects.create(course=course)
+            ),
+            user=Registration.objects.create(
+                user=CustomUser.objects.create_user(andrew_id="reviewer", email="reviewer@example.com"),
+                course=course,
+            ),
+            status=ArtifactReview.ArtifactReviewType.COMPLETED,
+        )
+        sections = self.current()
+        sections[0]["questions"][0]["text"] = "Edited"
+
+        # Act
+        response = self.client.patch(
+            f"/api/assignments/{self.survey.assignment_id}/surveys/",
+            {"survey_info": {"pk": self.survey.pk, "sections": sections}},
+            content_type="application/json",
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], "Cannot modify survey that has already been completed.")
+        self.assertEqual(self.current()[0]["questions"][0]["text"], "Text")
+
+
+class CloneSurveyTreeTest(TestCase):
+    def setUp(self):
+        self.assignment = Assignment.objects.create(
+            course=Course.objects.create(course_name="Course"), assignment_name="Assignment"
+        )
+        self.template = FeedbackSurvey.objects.create(assignment=self.assignment, name="Template")
+        for index in range(3):
+            section = SurveySection.objects.create(survey=self.template, title=f"Section {index}")
+            for number in range(2):
+                question = Question.objects.create(
+                    section=section,
+                    text=f"Question {index}.{number}",
+                    question_type=Question.QuestionType.MULTIPLECHOICE,
+                )
+                OptionChoice.objects.create(question=question, text="Yes")
+                OptionChoice.objects.create(question=question, text="No")
+
+    def tree(self, survey):
+        return [
+            (option_choice.question.section.title, option_choice.question.text, option_choice.text)
+            for option_choice in OptionChoice.objects.filter(question__section__survey=survey)
+            .select_related("question__section")
+            .order_by("pk")
+        ]
+
+    def test_clone_copies_the_whole_tree(self):
+        # Arrange
+        survey = FeedbackSurvey.objects.create(assignment=self.assignment, name="Copy")
+
+        # Act
+        clone_survey_tree(self.template, survey)
+
+        # Assert
+        self.assertEqual(len(self.tree(survey)), 12)
+        self.assertEqual(self.tree(survey), self.tree(self.template))
+        self.assertEqual(SurveySection.objects.filter(survey=self.template).count(), 3)
+
+
+class SurveyIsLockedTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(course_name="Course")
+        assignment = Assignment.objects.create(course=course, assignment_name="Assignment")
+        self.survey = FeedbackSurvey.objects.create(assignment=assignment)
+        artifact = Artifact.objects.create(assignment=assignment, entity=Individual.objects.create(course=course))
+        self.reviews = [
+            ArtifactReview.objects.create(
+                artifact=artifact,
+                user=Registration.objects.create(
+                    user=CustomUser.objects.create_user(andrew_id=f"user{index}", email=f"user{index}@example.com"),
+                    course=course,
+                ),
+            )
+            for index in range(3)
+        ]
+
+    def test_unlocked_without_completed_review(self):
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            locked = survey_is_locked(self.survey)
+
+        # Assert
+        self.assertFalse(locked)
+        self.assertEqual(len(queries), 1)
+
+    def test_locked_with_completed_review(self):
+        # Arrange
+        self.reviews[1].status = ArtifactReview.ArtifactReviewType.COMPLETED
+        self.reviews[1].save()
+
+        # Act
+        locked = survey_is_locked(self.survey)
+
+        # Assert
+        self.assertTrue(locked)
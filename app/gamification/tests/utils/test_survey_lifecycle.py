@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual
+from app.gamification.models.membership import Membership
+from app.gamification.models.registration import Registration
+from app.gamification.models.question import Question
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.survey_section import SurveySection
+from app.gamification.models.user import CustomUser
+from app.gamification.utils.survey_lifecycle import run_survey_lifecycle
+from app.gamification.utils.survey_tree import published_questions
+
+
+class SurveyLifecycleTest(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        course = Course.objects.create(course_name="Course")
+        self.assignment = Assignment.objects.create(course=course, assignment_name="Assignment", min_reviewers=2)
+        self.survey = FeedbackSurvey.objects.create(
+            assignment=self.assignment,
+            date_released=self.now - timedelta(hours=1),
+            date_due=self.now + timedelta(days=1),
+        )
+        for index in range(4):
+            user = CustomUser.objects.create_user(andrew_id=f"student{index}", email=f"student{index}@example.com")
+            individual = Individual.objects.create(course=course)
+            Membership.objects.create(student=Registration.objects.create(user=user, course=course), entity=individual)
+            Artifact.objects.create(assignment=self.assignment, entity=individual)
+
+    def test_release_assigns_reviews_once(self):
+        # Act
+        first = run_survey_lifecycle(self.now)
+        second = run_survey_lifecycle(self.now)
+
+        # Assert
+        self.assertEqual(first["released"], {self.survey.id: 8})
+        self.assertEqual(second["released"], {})
+        self.assertTrue(FeedbackSurvey.objects.get(id=self.survey.id).is_released)
+
+    def test_release_freezes_the_survey_structure(self):
+        # Arrange
+        section = SurveySection.objects.create(survey=self.survey, title="Section")
+        question = Question.objects.create(section=section, text="Before release")
+
+        # Act
+        run_survey_lifecycle(self.now)
+        Question.objects.filter(id=question.id).update(text="After release")
+        survey = FeedbackSurvey.objects.get(id=self.survey.id)
+
+        # Assert
+        self.assertEqual(survey.snapshot[0]["title"], "Section")
+        self.assertEqual(published_questions(survey)[question.id].text, "Before release")
+
+    def test_pending_reviews_become_late_after_due_date(self):
+        # Arrange
+        run_survey_lifecycle(self.now)
+        review = ArtifactReview.objects.first()
+        review.status = ArtifactReview.ArtifactReviewType.COMPLETED
+        review.save()
+        after_due = self.now + timedelta(days=2)
+
+        # Act
+        result = run_survey_lifecycle(after_due)
+        again = run_survey_lifecycle(after_due)
+
+        # Assert
+        self.assertEqual(result["late"], 7)
+        self.assertEqual(again["late"], 0)
+        self.assertEqual(
+            ArtifactReview.objects.get(id=review.id).status, ArtifactReview.ArtifactReviewType.COMPLETED
+        )
+
+    def test_only_the_current_survey_due_date_counts(self):
+        # Arrange
+        run_survey_lifecycle(self.now)
+        FeedbackSurvey.objects.filter(id=self.survey.id).update(date_due=self.now - timedelta(minutes=1))
+        current = FeedbackSurvey.objects.create(
+            assignment=self.assignment,
+            date_released=self.now - timedelta(hours=1),
+            date_due=self.now + timedelta(days=1),
+            is_released=True,
+        )
+
+        # Act
+        before_due = run_survey_lifecycle(self.now)
+        after_due = run_survey_lifecycle(current.date_due + timedelta(minutes=1))
+
+        # Assert
+        self.assertEqual(before_due["late"], 0)
+        self.assertEqual(after_due["late"], 8)
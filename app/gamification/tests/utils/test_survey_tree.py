@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from app.gamification.models.option_choice import OptionChoice
+from app.gamification.models.question import Question
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.survey_section import SurveySection
+from app.gamification.utils.survey_tree import bump_survey_version, survey_sections_data
+
+
+class SurveyTreeTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.survey = FeedbackSurvey.objects.create(name="Survey")
+        for section_index in range(3):
+            section = SurveySection.objects.create(survey=self.survey, title=f"Section {section_index}")
+            for question_type in Question.QuestionType.values:
+                question = Question.objects.create(section=section, text=question_type, question_type=question_type)
+                for option_index in range(2):
+                    OptionChoice.objects.create(question=question, text=f"Option {option_index}")
+
+    def test_tree_is_loaded_in_three_queries(self):
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            sections = survey_sections_data(self.survey)
+
+        # Assert
+        self.assertEqual(len(queries), 3)
+        self.assertEqual([section["title"] for section in sections], ["Section 0", "Section 1", "Section 2"])
+        self.assertEqual(len(sections[0]["questions"]), len(Question.QuestionType.values))
+
+    def test_question_shape_matches_question_type(self):
+        # Act
+        sections = survey_sections_data(self.survey)
+        questions = {question["question_type"]: question for question in sections[0]["questions"]}
+
+        # Assert
+        self.assertEqual(
+            [option["text"] for option in questions[Question.QuestionType.MULTIPLECHOICE]["option_choices"]],
+            ["Option 0", "Option 1"],
+        )
+        self.assertIn("number_of_scale", questions[Question.QuestionType.SCALEMULTIPLECHOICE])
+        self.assertIn("number_of_text", questions[Question.QuestionType.TEXTAREA])
+
+    def test_tree_is_cached_per_version(self):
+        # Arrange
+        survey_sections_data(self.survey)
+
+        # Act
+        with CaptureQueriesContext(connection) as cached_queries:
+            survey_sections_data(self.survey)
+        SurveySection.objects.create(survey=self.survey, title="Section 3")
+        bump_survey_version(self.survey.id)
+        self.survey.refresh_from_db()
+        sections = survey_sections_data(self.survey)
+
+        # Assert
+        self.assertEqual(len(cached_queries), 0)
+        self.assertEqual(len(sections), 4)
@@ -0,0 +1,180 @@
+import os
+from datetime import timedelta
+
+import jwt
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.behavior import Behavior
+from app.gamification.models.course import Course
+from app.gamification.models.entity import Individual
+from app.gamification.models.membership import Membership
+from app.gamification.models.notification import Notification
+from app.gamification.models.option_choice import OptionChoice
+from app.gamification.models.question import Question
+from app.gamification.models.registration import Registration
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.survey_section import SurveySection
+from app.gamification.models.user import CustomUser
+
+
+def auth_header(user):
+    token = jwt.encode({"id": user.id}, os.getenv("SECRET_KEY"), algorithm="HS256")
+    # PyJWT 1.x returns bytes, 2.x str
+    if isinstance(token, bytes):
+        token = token.decode()
+    return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+
+class CompletedReviewCountTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        for operation in ["survey", "optional_survey", "late"]:
+            Behavior.objects.create(operation=operation, points=10)
+        self.course = Course.objects.create(course_name="Course")
+        self.assignment = Assignment.objects.create(course=self.course, assignment_name="Assignment")
+        section = SurveySection.objects.create(survey=FeedbackSurvey.objects.create(assignment=self.assignment))
+        self.question = Question.objects.create(section=section, question_type=Question.QuestionType.TEXTAREA)
+        OptionChoice.objects.create(question=self.question)
+
+        self.user = CustomUser.objects.create_user(andrew_id="reviewer", email="reviewer@example.com")
+        self.registration = Registration.objects.create(user=self.user, course=self.course)
+        own_entity = Individual.objects.create(course=self.course)
+        Membership.objects.create(student=self.registration, entity=own_entity)
+        # reviewed, least reviewed but already assigned, least reviewed, most reviewed, own
+        self.artifacts = [
+            Artifact.objects.create(
+                assignment=self.assignment,
+                entity=Individual.objects.create(course=self.course),
+                completed_review_count=count,
+            )
+            for count in [0, 1, 1, 3]
+        ]
+        self.own_artifact = Artifact.objects.create(assignment=self.assignment, entity=own_entity)
+        self.review = ArtifactReview.objects.create(artifact=self.artifacts[0], user=self.registration)
+        ArtifactReview.objects.create(
+            artifact=self.artifacts[1],
+            user=self.registration,
+            status=ArtifactReview.ArtifactReviewType.OPTIONAL_INCOMPLETE,
+        )
+
+    def url(self, suffix=""):
+        return (
+            f"/api/courses/{self.course.id}/assignments/{self.assignment.id}/artifact_reviews/{self.review.id}/"
+            + suffix
+        )
+
+    def submit(self):
+        return self.client.patch(
+            self.url(),
+            {"artifact_review_detail": [{"question_pk": self.question.pk, "answer_text": "Looks good"}]},
+            content_type="application/json",
+            **auth_header(self.user),
+        )
+
+    def completed_review_count(self):
+        return Artifact.objects.get(id=self.artifacts[0].id).completed_review_count
+
+    def test_submission_counts_once(self):
+        # Act
+        first = self.submit()
+        second = self.submit()
+
+        # Assert
+        self.assertEqual((first.status_code, second.status_code), (200, 200))
+        self.assertEqual(self.completed_review_count(), 1)
+
+    def test_optional_artifact_is_the_least_reviewed_not_yet_assigned(self):
+        # Act
+        self.submit()
+
+        # Assert
+        optional = ArtifactReview.objects.filter(
+            user=self.registration, status=ArtifactReview.ArtifactReviewType.OPTIONAL_INCOMPLETE
+        )
+        self.assertEqual(
+            list(optional.order_by("id").values_list("artifact_id", flat=True)),
+            [self.artifacts[1].id, self.artifacts[2].id],
+        )
+
+    def test_status_changes_adjust_the_count(self):
+        # Arrange
+        counts = []
+
+        # Act
+        for review_status in ["COMPLETED", "COMPLETED", "REOPEN", "INCOMPLETE", "COMPLETED"]:
+            self.client.patch(self.url("status/"), {"status": review_status}, content_type="application/json")
+            counts.append(self.completed_review_count())
+
+        # Assert
+        self.assertEqual(counts, [1, 1, 0, 0, 1])
+
+
+class ArtifactReviewersPokeTest(TestCase):
+    def setUp(self):
+        course = Course.objects.create(course_name="Course")
+        assignment = Assignment.objects.create(course=course, assignment_name="Assignment")
+        self.artifact = Artifact.objects.create(assignment=assignment, entity=Individual.objects.create(course=course))
+        self.url = (
+            f"/api/courses/{course.id}/assignments/{assignment.id}/artifacts/{self.artifact.id}/artifact_reviews/"
+        )
+        self.sender = CustomUser.objects.create_user(andrew_id="sender", email="sender@example.com")
+        self.other_sender = CustomUser.objects.create_user(andrew_id="other", email="other@example.com")
+        self.reviewers = []
+        for index in range(5):
+            reviewer = CustomUser.objects.create_user(
+                andrew_id=f"reviewer{index}", email=f"reviewer{index}@example.com"
+            )
+            ArtifactReview.objects.create(
+                artifact=self.artifact, user=Registration.objects.create(user=reviewer, course=course)
+            )
+            self.reviewers.append(reviewer)
+
+    def poke(self, receiver, age, sender=None):
+        notification = Notification.objects.create(sender=sender or self.sender, receiver=receiver)
+        # timestamp is auto_now, so backdate it after saving
+        Notification.objects.filter(id=notification.id).update(timestamp=timezone.now() - age)
+
+    def get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, **auth_header(self.sender))
+        return {review["reviewer"]: review["pokable"] for review in response.json()}, len(queries)
+
+    def test_pokable_follows_count_and_latest_poke_per_reviewer(self):
+        # Arrange
+        self.poke(self.reviewers[1], timedelta(days=2))
+        self.poke(self.reviewers[1], timedelta(hours=1), sender=self.other_sender)
+        self.poke(self.reviewers[2], timedelta(hours=1))
+        for days in [2, 3, 4]:
+            self.poke(self.reviewers[3], timedelta(days=days))
+        self.poke(self.reviewers[4], timedelta(days=3))
+        self.poke(self.reviewers[4], timedelta(hours=1))
+
+        # Act
+        pokable, _ = self.get()
+
+        # Assert
+        self.assertEqual(
+            pokable,
+            {"reviewer0": True, "reviewer1": True, "reviewer2": False, "reviewer3": False, "reviewer4": False},
+        )
+
+    def test_poke_lookup_does_not_grow_with_reviewers(self):
+        # Arrange
+        for reviewer in self.reviewers:
+            self.poke(reviewer, timedelta(days=2))
+        _, many_reviewers = self.get()
+        ArtifactReview.objects.filter(user__user__in=self.reviewers[1:]).delete()
+
+        # Act
+        pokable, one_reviewer = self.get()
+
+        # Assert
+        self.assertEqual(pokable, {"reviewer0": True})
+        self.assertEqual(many_reviewers, one_reviewer)
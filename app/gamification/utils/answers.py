@@ -0,0 +1,160 @@
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db.models import F
+
+from app.gamification.models.answer import Answer, ArtifactFeedback
+from app.gamification.models.question import Question
+from app.gamification.utils.db import bulk_create_children, bulk_create_with_pks
+
+CHOICE_QUESTION_TYPES = (Question.QuestionType.MULTIPLECHOICE, Question.QuestionType.MULTIPLESELECT)
+
+
+def answers_by_question(artifact_review_ids):
+    """
+    Answers of the given artifact reviews in a single query, grouped as
+    {question id: {artifact review id: [answer, ...]}} in the order they were given.
+
+    Each answer is a dict with `answer_text`, `page` (the slide of an artifact feedback, None
+    for any other answer) and `reviewer_id`, the user id of the reviewer.
+    """
+    rows = (
+        Answer.objects.filter(artifact_review_id__in=artifact_review_ids)
+        .order_by("index", "id")
+        .values(
+            "artifact_review_id",
+            "answer_text",
+            question_pk=F("option_choice__question_id"),
+            page=F("artifactfeedback__page"),
+            reviewer_id=F("artifact_review__user__user_id"),
+        )
+    )
+    grouped = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        grouped[row["question_pk"]][row["artifact_review_id"]].append(row)
+    return grouped
+
+
+def question_answers(grouped, question, artifact_review_id):
+    """
+    Answers of one review to one question: slide reviews only keep artifact feedback,
+    other questions never carry a page.
+    """
+    answers = grouped.get(question.pk, {}).get(artifact_review_id, [])
+    if question.question_type == Question.QuestionType.SLIDEREVIEW:
+        return [answer for answer in answers if answer["page"] is not None]
+    return [{**answer, "page": None} for answer in answers]
+
+
+def build_answers(artifact_review, questions, artifact_review_detail, draft=False):
+    """
+    Validate a submitted review against `questions` ({question pk: question}, see
+    `published_questions`) and build its unsaved answers, in the order they were submitted.
+
+    Slide review answers are `ArtifactFeedback`, choice answers that match none of the
+    options are skipped, and each answer is numbered among the answers to its question.
+    Required questions may be left blank in a draft. Raises `ValidationError` on the first
+    invalid answer, before anything is written.
+    """
+    answers = []
+    indexes = defaultdict(int)
+    for detail in artifact_review_detail:
+        try:
+            question = questions.get(int(detail["question_pk"]))
+        except (TypeError, ValueError):
+            question = None
+        if question is None:
+            raise ValidationError("Question not found.")
+        answer_text = detail["answer_text"]
+        if answer_text == "":
+            if question.is_required and not draft:
+                raise ValidationError("Please answer all required questions.")
+            continue
+        fields = {"artifact_review": artifact_review, "question_id": question.pk, "answer_text": answer_text}
+        if question.question_type in CHOICE_QUESTION_TYPES:
+            option_choice = next((option for option in question.option_list if option.text == answer_text), None)
+            if option_choice is None:
+                continue
+            answer = Answer(option_choice_id=option_choice.pk, **fields)
+        elif question.question_type == Question.QuestionType.SLIDEREVIEW:
+            answer = ArtifactFeedback(option_choice_id=question.option_list[0].pk, page=detail["page"], **fields)
+        else:
+            answer = Answer(option_choice_id=question.option_list[0].pk, **fields)
+        answer.index = indexes[question.pk]
+        indexes[question.pk] += 1
+        answers.append(answer)
+    return answers
+
+
+def _page(answer):
+    if isinstance(answer, ArtifactFeedback):
+        return str(answer.page)
+    try:
+        return answer.artifactfeedback.page
+    except ArtifactFeedback.DoesNotExist:
+        return None
+
+
+def upsert_answers(artifact_review, answers):
+    """
+    Make the saved answers of `artifact_review` match `answers` (see `build_answers`),
+    matching rows on (question, index) and only writing the ones that changed.
+
+    Saving a draft again, or submitting it, leaves the unchanged rows alone; the rest is one
+    delete, one bulk update per table and one bulk insert per table. Call inside a
+    transaction. Returns the number of created, updated and deleted answers.
+    """
+    existing = {
+        (answer.question_id, answer.index): answer
+        for answer in Answer.objects.filter(artifact_review=artifact_review).select_related("artifactfeedback")
+    }
+    created, updated, updated_feedback = [], [], []
+    removed = []
+    for answer in answers:
+        previous = existing.pop((answer.question_id, answer.index), None)
+        page = _page(answer)
+        if previous is None or (_page(previous) is None) != (page is None):
+            # An answer that turns into artifact feedback, or back, is recreated
+            if previous is not None:
+                removed.append(previous)
+            created.append(answer)
+            continue
+        if (previous.option_choice_id, previous.answer_text) != (answer.option_choice_id, answer.answer_text):
+            previous.option_choice_id = answer.option_choice_id
+            previous.answer_text = answer.answer_text
+            updated.append(previous)
+        if page is not None and previous.artifactfeedback.page != page:
+            previous.artifactfeedback.page = page
+            updated_feedback.append(previous.artifactfeedback)
+
+    # Removed answers go first, a recreated answer takes over the (question, index) of the old one
+    removed += existing.values()
+    Answer.objects.filter(pk__in=[answer.pk for answer in removed]).delete()
+    Answer.objects.bulk_update(updated, ["option_choice", "answer_text"])
+    ArtifactFeedback.objects.bulk_update(updated_feedback, ["page"])
+
+    # Parent rows of the artifact feedback go in with the other answers, then the child rows
+    rows = [
+        Answer(
+            artifact_review=answer.artifact_review,
+            option_choice_id=answer.option_choice_id,
+            question_id=answer.question_id,
+            index=answer.index,
+            answer_text=answer.answer_text,
+        )
+        if isinstance(answer, ArtifactFeedback)
+        else answer
+        for answer in created
+    ]
+    bulk_create_with_pks(Answer, rows)
+    feedback = []
+    for answer, row in zip(created, rows):
+        if isinstance(answer, ArtifactFeedback):
+            answer.id = answer.answer_ptr_id = row.pk
+            feedback.append(answer)
+    bulk_create_children(ArtifactFeedback, feedback)
+    return {
+        "created": len(created),
+        "updated": len({answer.pk for answer in updated} | {answer.pk for answer in updated_feedback}),
+        "deleted": len(removed),
+    }
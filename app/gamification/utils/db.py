@@ -0,0 +1,41 @@
+from django.db import connections, router
+
+
+def bulk_create_with_pks(model, objs, batch_size=None):
+    """
+    `bulk_create` that always sets the primary keys of the created objects.
+
+    Backends that cannot return rows from a bulk insert (SQLite before Django 4, MySQL)
+    fall back to one INSERT per object.
+    """
+    objs = list(objs)
+    if not objs:
+        return objs
+    connection = connections[router.db_for_write(model)]
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs, batch_size=batch_size)
+    for obj in objs:
+        obj.save(force_insert=True)
+    return objs
+
+
+def bulk_create_children(model, objs):
+    """
+    Insert the child rows of multi-table inherited objects whose parent rows already exist.
+
+    The parent link of each object must be set beforehand; only the child table's own
+    columns are written, in a single INSERT. This is the only place the app inserts rows
+    through the manager's private `_insert`, pinned by `tests/utils/test_db.py`.
+    """
+    objs = list(objs)
+    if not objs:
+        return objs
+    using = router.db_for_write(model)
+    # `bulk_create` refuses multi-table inheritance and `save()` would insert the parent rows
+    # a second time, so the child rows go through `_insert`, which is what `save()` itself
+    # uses for the child table (`Model._do_insert`). Revisit on Django upgrades.
+    model._base_manager._insert(objs, fields=model._meta.local_concrete_fields, using=using)
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = using
+    return objs
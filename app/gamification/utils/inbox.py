@@ -0,0 +1,77 @@
+from django.db.models import Case, CharField, F, OuterRef, Subquery, When
+from django.utils import timezone
+
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.membership import Membership
+from app.gamification.models.survey import FeedbackSurvey
+
+INBOX_FIELDS = (
+    "id",
+    "artifact",
+    "user",
+    "status",
+    "max_artifact_review_score",
+    "artifact_review_score",
+    "reviewing",
+    "assignment_type",
+    "date_due",
+    "course_id",
+    "course_number",
+    "assignment_id",
+)
+
+
+def reviewee_label():
+    """
+    Expression of what an artifact review is about: the andrew id of the student for an
+    individual artifact, the team name for a team artifact.
+    """
+    reviewee = (
+        Membership.objects.filter(entity_id=OuterRef("artifact__entity_id"))
+        .order_by("id")
+        .values("student__user__andrew_id")[:1]
+    )
+    return Case(
+        When(
+            artifact__assignment__assignment_type=Assignment.AssigmentType.Team,
+            then=F("artifact__entity__team__name"),
+        ),
+        default=Subquery(reviewee),
+        output_field=CharField(),
+    )
+
+
+def pending_reviews(user_id, now=None):
+    """
+    Released, not completed artifact reviews of a user in every course, in a single query.
+
+    The survey dates and the reviewee label (andrew id of the individual or team name) are
+    computed by the database. LATE is set by the survey scheduler, see `utils.survey_lifecycle`.
+    """
+    now = now or timezone.now()
+    survey = FeedbackSurvey.objects.filter(assignment_id=OuterRef("artifact__assignment_id")).order_by("-id")
+    return (
+        ArtifactReview.objects.filter(user__user_id=user_id)
+        .exclude(status=ArtifactReview.ArtifactReviewType.COMPLETED)
+        .annotate(
+            date_released=Subquery(survey.values("date_released")[:1]),
+            date_due=Subquery(survey.values("date_due")[:1]),
+        )
+        .filter(date_released__lte=now)
+        .annotate(
+            assignment_type=F("artifact__assignment__assignment_type"),
+            reviewing=reviewee_label(),
+            course_id=F("user__course_id"),
+            course_number=F("user__course__course_number"),
+            assignment_id=F("artifact__assignment_id"),
+        )
+        .order_by("id")
+    )
+
+
+def user_review_inbox(user_id, now=None):
+    """
+    Rows of the student review inbox.
+    """
+    return list(pending_reviews(user_id, now).values(*INBOX_FIELDS))
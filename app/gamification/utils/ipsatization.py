@@ -0,0 +1,310 @@
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.ipsatization_result import IpsatizationResult
+
+DEFAULT_IPSATIZATION_MAX = 100
+DEFAULT_IPSATIZATION_MIN = 80
+
+REVIEW_FIELDS = ("user_id", "artifact_id", "artifact_review_score", "max_artifact_review_score")
+
+
+def _scored_reviews():
+    return ArtifactReview.objects.filter(max_artifact_review_score__gt=0).exclude(
+        status=ArtifactReview.ArtifactReviewType.INCOMPLETE
+    )
+
+
+def _artifact_ids(assignment_id):
+    return list(Artifact.objects.filter(assignment_id=assignment_id).order_by("id").values_list("id", flat=True))
+
+
+def _score_matrix(artifact_ids, reviews):
+    """
+    Masked reviewer × artifact matrix of `reviews`, an array of
+    (reviewer id, artifact id, score, max score) rows of artifacts in the sorted `artifact_ids`.
+    """
+    artifact_ids = np.array(artifact_ids, dtype=int)
+    reviews = np.asarray(reviews, dtype=float).reshape(-1, 4)
+    reviewer_ids, rows = np.unique(reviews[:, 0].astype(int), return_inverse=True)
+    columns = np.searchsorted(artifact_ids, reviews[:, 1].astype(int))
+
+    data = np.zeros((len(reviewer_ids), len(artifact_ids)))
+    mask = np.ones(data.shape, dtype=bool)
+    data[rows, columns] = reviews[:, 2] / reviews[:, 3]
+    mask[rows, columns] = False
+    return reviewer_ids.tolist(), artifact_ids.tolist(), np.ma.masked_array(data, mask)
+
+
+def review_score_matrix(assignment_id):
+    """
+    Scores of the submitted reviews of an assignment as a reviewer × artifact masked array.
+
+    Returns (reviewer registration ids, artifact ids, matrix) where rows and columns follow
+    the two id lists, each cell holds `artifact_review_score / max_artifact_review_score`,
+    and cells without a scored review are masked. Two queries, no per-review Python lookups.
+    """
+    reviews = _scored_reviews().filter(artifact__assignment_id=assignment_id).values_list(*REVIEW_FIELDS)
+    return _score_matrix(_artifact_ids(assignment_id), list(reviews))
+
+
+def row_terms(scores):
+    """
+    Split the ipsatized matrix into per-reviewer terms: (base, deltas).
+
+    Every reviewer's missing reviews are filled with the mean of their reviews, then their
+    scores are standardized by their own mean and sample standard deviation (or mapped from
+    [0, 1] to [-1, 1] when they gave every artifact the same score). `base` is the ipsatized
+    value of the filled cells of each row, `deltas` the ipsatized value of the reviewed cells
+    minus `base` and 0 elsewhere, so that an artifact's ipsatized mean over the reviewers is
+    `(base.sum() + deltas[:, artifact].sum()) / reviewers`. Rows must have a review each.
+    """
+    mask = np.ma.getmaskarray(scores)
+    artifacts = scores.shape[1]
+    means = scores.mean(axis=1).filled()[:, np.newaxis]
+    filled = np.where(mask, means, scores.filled(0))
+    stds = filled.std(axis=1, ddof=1)[:, np.newaxis] if artifacts > 1 else np.zeros_like(means)
+    standardized = np.divide(filled - means, stds, out=np.zeros_like(filled), where=stds != 0)
+    ipsatized = np.where(stds != 0, standardized, (filled - 0.5) * 2)
+    base = np.where(stds != 0, 0.0, (means - 0.5) * 2)
+    deltas = np.where(mask, 0.0, ipsatized - base)
+    return base[:, 0], deltas
+
+
+def scale_scores(artifact_means, ipsatization_max, ipsatization_min):
+    """
+    Min-max scale the ipsatized artifact means onto [ipsatization_min, ipsatization_max];
+    equal means all get the maximum.
+    """
+    lowest, highest = artifact_means.min(), artifact_means.max()
+    if highest > lowest:
+        normalized = (artifact_means - lowest) / (highest - lowest)
+    else:
+        normalized = np.ones(len(artifact_means))
+    return normalized * (ipsatization_max - ipsatization_min) + ipsatization_min
+
+
+def ipsatized_means(scores):
+    """
+    Mean ipsatized score of each artifact (column) of a reviewer × artifact masked score
+    matrix, see `row_terms`. Artifacts are NaN when nobody reviewed anything.
+    """
+    scores = np.ma.masked_array(scores)
+    scores = scores[~np.ma.getmaskarray(scores).all(axis=1)]
+    if scores.shape[0] == 0 or scores.shape[1] == 0:
+        return np.full(scores.shape[1], np.nan)
+    base, deltas = row_terms(scores)
+    return (base.sum() + deltas.sum(axis=0)) / scores.shape[0]
+
+
+def ipsatize(scores, ipsatization_max=DEFAULT_IPSATIZATION_MAX, ipsatization_min=DEFAULT_IPSATIZATION_MIN):
+    """
+    Ipsatized score of each artifact of a reviewer × artifact masked score matrix: the
+    `ipsatized_means` scaled by `scale_scores`.
+    """
+    artifact_means = ipsatized_means(scores)
+    if np.isnan(artifact_means).all():
+        return artifact_means
+    return scale_scores(artifact_means, ipsatization_max, ipsatization_min)
+
+
+def _result_scores(result):
+    if not result.rows or not result.artifact_ids:
+        return [None] * len(result.artifact_ids)
+    artifact_means = (result.base_total + np.array(result.column_deltas)) / len(result.rows)
+    return scale_scores(artifact_means, result.ipsatization_max, result.ipsatization_min).tolist()
+
+
+def ipsatization_bounds(assignment):
+    """
+    (max, min) of the ipsatized scores of an assignment: its own bounds if both are set.
+    """
+    if assignment.ipsatization_max and assignment.ipsatization_min:
+        return assignment.ipsatization_max, assignment.ipsatization_min
+    return DEFAULT_IPSATIZATION_MAX, DEFAULT_IPSATIZATION_MIN
+
+
+def _compute_result(assignment, artifact_ids, reviews):
+    reviewer_ids, artifact_ids, scores = _score_matrix(artifact_ids, reviews)
+    result = IpsatizationResult(
+        assignment=assignment,
+        review_version=assignment.review_version,
+        artifact_ids=artifact_ids,
+        column_deltas=[0.0] * len(artifact_ids),
+    )
+    if reviewer_ids and artifact_ids:
+        base, deltas = row_terms(scores)
+        reviewed = ~np.ma.getmaskarray(scores)
+        result.rows = {
+            str(reviewer_id): {
+                "base": float(base[row]),
+                "deltas": {
+                    str(artifact_ids[column]): float(deltas[row, column]) for column in np.flatnonzero(reviewed[row])
+                },
+            }
+            for row, reviewer_id in enumerate(reviewer_ids)
+        }
+        result.column_deltas = deltas.sum(axis=0).tolist()
+        result.base_total = float(base.sum())
+    return result
+
+
+def ipsatization_scores(assignment, ipsatization_max, ipsatization_min):
+    """
+    {artifact id: ipsatized score} of an assignment. An artifact nobody reviewed gets the score of
+    the reviewers' means it was filled with; every score is None only while no review is submitted.
+
+    Served from the stored `IpsatizationResult` while it matches the assignment's reviews and
+    artifacts (two small queries, no review scan); otherwise recomputed from the full matrix.
+    Only results scaled to the assignment's own `ipsatization_bounds` are stored, other bounds
+    are scaled in memory.
+    """
+    configured = (ipsatization_max, ipsatization_min) == ipsatization_bounds(assignment)
+    artifact_ids = _artifact_ids(assignment.id)
+    result = IpsatizationResult.objects.filter(assignment=assignment).first()
+    if result is None or result.review_version != assignment.review_version or result.artifact_ids != artifact_ids:
+        reviews = _scored_reviews().filter(artifact__assignment_id=assignment.id).values_list(*REVIEW_FIELDS)
+        result = _compute_result(assignment, artifact_ids, list(reviews))
+        result.ipsatization_max, result.ipsatization_min = ipsatization_max, ipsatization_min
+        result.scores = _result_scores(result)
+        # Only store the result if no review changed meanwhile
+        if configured:
+            with transaction.atomic():
+                current = Assignment.objects.select_for_update().get(id=assignment.id).review_version
+                if current == result.review_version:
+                    IpsatizationResult.objects.filter(assignment=assignment).delete()
+                    result.save()
+    elif (result.ipsatization_max, result.ipsatization_min) != (ipsatization_max, ipsatization_min):
+        result.ipsatization_max, result.ipsatization_min = ipsatization_max, ipsatization_min
+        result.scores = _result_scores(result)
+        if configured:
+            IpsatizationResult.objects.filter(id=result.id, review_version=result.review_version).update(
+                ipsatization_max=ipsatization_max, ipsatization_min=ipsatization_min, scores=result.scores
+            )
+    return dict(zip(result.artifact_ids, result.scores))
+
+
+def normalize_scores(course_ids=None, force=False):
+    """
+    Store the ipsatization result of every assignment of `course_ids` (all courses if None)
+    in one batch, for the report to serve without recomputing.
+
+    The artifacts, reviews and stored results of all the assignments are loaded with one
+    query each and split per assignment in NumPy; results that are still current with the
+    assignment's bounds are skipped unless `force`. Returns the number of results stored.
+    """
+    assignments = Assignment.objects.only("id", "review_version", "ipsatization_max", "ipsatization_min")
+    if course_ids is not None:
+        assignments = assignments.filter(course_id__in=course_ids)
+    assignments = {assignment.id: assignment for assignment in assignments}
+
+    artifact_ids = defaultdict(list)
+    artifacts = Artifact.objects.filter(assignment_id__in=assignments).order_by("id")
+    for assignment_id, artifact_id in artifacts.values_list("assignment_id", "id"):
+        artifact_ids[assignment_id].append(artifact_id)
+    if not force:
+        stored = IpsatizationResult.objects.filter(assignment_id__in=assignments).values_list(
+            "assignment_id", "review_version", "artifact_ids", "ipsatization_max", "ipsatization_min"
+        )
+        for assignment_id, review_version, stored_artifact_ids, *bounds in stored:
+            assignment = assignments[assignment_id]
+            if (
+                review_version == assignment.review_version
+                and stored_artifact_ids == artifact_ids[assignment_id]
+                and tuple(bounds) == ipsatization_bounds(assignment)
+            ):
+                del assignments[assignment_id]
+    if not assignments:
+        return 0
+
+    reviews = _scored_reviews().filter(artifact__assignment_id__in=assignments)
+    reviews = np.array(list(reviews.values_list("artifact__assignment_id", *REVIEW_FIELDS)), dtype=float).reshape(-1, 5)
+    reviews = reviews[np.argsort(reviews[:, 0], kind="stable")]
+    review_assignment_ids, starts = np.unique(reviews[:, 0].astype(int), return_index=True)
+    reviews_by_assignment = dict(zip(review_assignment_ids.tolist(), np.split(reviews[:, 1:], starts[1:])))
+
+    results = []
+    for assignment_id, assignment in assignments.items():
+        result = _compute_result(assignment, artifact_ids[assignment_id], reviews_by_assignment.get(assignment_id, []))
+        result.ipsatization_max, result.ipsatization_min = ipsatization_bounds(assignment)
+        result.scores = _result_scores(result)
+        results.append(result)
+
+    with transaction.atomic():
+        # Only store the results of assignments whose reviews did not change meanwhile
+        versions = dict(
+            Assignment.objects.select_for_update().filter(id__in=assignments).values_list("id", "review_version")
+        )
+        results = [result for result in results if versions.get(result.assignment_id) == result.review_version]
+        IpsatizationResult.objects.filter(assignment_id__in=[result.assignment_id for result in results]).delete()
+        IpsatizationResult.objects.bulk_create(results, batch_size=500)
+    return len(results)
+
+
+def _update_rows(result, reviewer_ids):
+    """
+    Replace the terms of `reviewer_ids` in `result` from their current reviews.
+    """
+    columns = {artifact_id: column for column, artifact_id in enumerate(result.artifact_ids)}
+    column_deltas = np.array(result.column_deltas, dtype=float)
+    for reviewer_id in map(str, reviewer_ids):
+        old = result.rows.pop(reviewer_id, None)
+        if old is not None:
+            result.base_total -= old["base"]
+            for artifact_id, delta in old["deltas"].items():
+                column_deltas[columns[int(artifact_id)]] -= delta
+
+    reviews = (
+        _scored_reviews()
+        .filter(artifact__assignment_id=result.assignment_id, user_id__in=reviewer_ids)
+        .values_list(*REVIEW_FIELDS)
+    )
+    cells = {}
+    for user_id, artifact_id, score, max_score in reviews:
+        cells.setdefault(user_id, {})[artifact_id] = score / max_score
+    for reviewer_id, reviewed in cells.items():
+        data = np.zeros((1, len(result.artifact_ids)))
+        mask = np.ones(data.shape, dtype=bool)
+        for artifact_id, score in reviewed.items():
+            data[0, columns[artifact_id]] = score
+            mask[0, columns[artifact_id]] = False
+        base, deltas = row_terms(np.ma.masked_array(data, mask))
+        result.rows[str(reviewer_id)] = {
+            "base": float(base[0]),
+            "deltas": {str(artifact_id): float(deltas[0, columns[artifact_id]]) for artifact_id in reviewed},
+        }
+        result.base_total += float(base[0])
+        column_deltas += deltas[0]
+    result.column_deltas = column_deltas.tolist()
+
+
+def reviews_changed(assignment_id, reviewer_ids=None):
+    """
+    Record that reviews of an assignment were submitted, reopened or rescored; call it in
+    the transaction making the change.
+
+    Bumps the assignment's review version. With `reviewer_ids`, a stored ipsatization result
+    that was up to date is kept up to date by recomputing only those reviewers' terms and
+    rescaling the artifact means; without, or if it was already stale, it is dropped.
+    """
+    Assignment.objects.filter(id=assignment_id).update(review_version=F("review_version") + 1)
+    result = IpsatizationResult.objects.select_for_update().filter(assignment_id=assignment_id).first()
+    if result is None:
+        return
+    version = Assignment.objects.values_list("review_version", flat=True).get(id=assignment_id)
+    if reviewer_ids is None or result.review_version != version - 1:
+        result.delete()
+        return
+    if result.artifact_ids != _artifact_ids(assignment_id):
+        result.delete()
+        return
+    _update_rows(result, reviewer_ids)
+    result.review_version = version
+    result.scores = _result_scores(result)
+    result.save()
@@ -0,0 +1,131 @@
+"""
+Normalizers turning a reviewer × artifact masked matrix of review scores (each cell
+`artifact_review_score / max_artifact_review_score`, masked where there is no scored review)
+into one value per artifact, NaN for artifacts they cannot score. All of them are vectorized
+over the whole matrix; `normalize` scales their values onto the report's [min, max] range.
+"""
+import numpy as np
+
+from app.gamification.utils.ipsatization import ipsatization_scores, ipsatized_means, review_score_matrix, scale_scores
+
+DEFAULT_METHOD = "ipsatization"
+# Share of the lowest and of the highest scores of an artifact left out by `trimmed_means`
+TRIM_PROPORTION = 0.1
+
+
+def _column_means(values, mask):
+    counts = (~mask).sum(axis=0)
+    sums = np.where(mask, 0.0, values).sum(axis=0)
+    return np.divide(sums, counts, out=np.full(values.shape[1], np.nan), where=counts > 0)
+
+
+def z_score_means(scores):
+    """
+    Mean over its reviewers of each artifact's score standardized by the reviewer's own mean
+    and standard deviation; reviewers giving every artifact the same score count as 0.
+    """
+    mask = np.ma.getmaskarray(scores)
+    means = scores.mean(axis=1).filled(0)[:, np.newaxis]
+    stds = scores.std(axis=1).filled(0)[:, np.newaxis]
+    standardized = np.divide(scores.filled(0) - means, stds, out=np.zeros(scores.shape), where=stds != 0)
+    return _column_means(standardized, mask)
+
+
+def percentile_means(scores):
+    """
+    Mean over its reviewers of each artifact's percentile among the reviewer's reviews,
+    `(rank + 0.5) / reviews` with tied scores sharing their average rank.
+    """
+    mask = np.ma.getmaskarray(scores)
+    if not scores.size:
+        return np.full(scores.shape[1], np.nan)
+    # Sort every row, unreviewed cells last, then find the first and last position of each
+    # run of tied scores: below = first position, not above = last position + 1
+    values = np.where(mask, np.inf, scores.filled(0))
+    order = np.argsort(values, axis=1, kind="stable")
+    ordered = np.take_along_axis(values, order, axis=1)
+    positions = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    starts = np.ones(scores.shape, dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ends = np.ones(scores.shape, dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    below = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+    not_above = np.minimum.accumulate(np.where(ends, positions, scores.shape[1])[:, ::-1], axis=1)[:, ::-1] + 1
+    ranks = np.empty(scores.shape)
+    np.put_along_axis(ranks, order, below + not_above, axis=1)
+    counts = (~mask).sum(axis=1)[:, np.newaxis]
+    percentiles = np.divide(ranks, 2 * counts, out=np.zeros(scores.shape), where=counts > 0)
+    return _column_means(percentiles, mask)
+
+
+def trimmed_means(scores, proportion=TRIM_PROPORTION):
+    """
+    Mean of each artifact's scores without the `proportion` lowest and highest ones.
+    """
+    mask = np.ma.getmaskarray(scores)
+    ordered = np.sort(np.where(mask, np.inf, scores.filled(0)), axis=0)
+    counts = (~mask).sum(axis=0)
+    trimmed = np.floor(counts * proportion).astype(int)
+    sums = np.vstack([np.zeros(scores.shape[1]), np.cumsum(np.where(np.isinf(ordered), 0.0, ordered), axis=0)])
+    columns = np.arange(scores.shape[1])
+    kept = counts - 2 * trimmed
+    totals = sums[counts - trimmed, columns] - sums[trimmed, columns]
+    return np.divide(totals, kept, out=np.full(scores.shape[1], np.nan), where=kept > 0)
+
+
+def shrunk_means(scores):
+    """
+    Empirical Bayes estimate of each artifact's score: its mean shrunk toward the mean of all
+    artifacts by `reviews / (reviews + k)`, where k is the ratio of the spread of the scores
+    an artifact gets to the spread between artifacts. Scarcely reviewed artifacts move the most.
+    """
+    mask = np.ma.getmaskarray(scores)
+    values = scores.filled(0)
+    counts = (~mask).sum(axis=0)
+    artifact_means = _column_means(values, mask)
+    reviewed = counts > 0
+    if not reviewed.any():
+        return artifact_means
+    prior = artifact_means[reviewed].mean()
+    residuals = np.where(mask, 0.0, values - np.where(reviewed, artifact_means, 0.0))
+    degrees = counts.sum() - reviewed.sum()
+    within = (residuals**2).sum() / degrees if degrees > 0 else 0.0
+    between = artifact_means[reviewed].var() - within / counts[reviewed].mean()
+    if between <= 0:
+        return np.where(reviewed, prior, np.nan)
+    weights = counts / (counts + within / between)
+    return np.where(reviewed, prior + weights * (artifact_means - prior), np.nan)
+
+
+NORMALIZERS = {
+    "ipsatization": ipsatized_means,
+    "zscore": z_score_means,
+    "percentile": percentile_means,
+    "trimmed": trimmed_means,
+    "bayesian": shrunk_means,
+}
+
+
+def normalize(scores, method=DEFAULT_METHOD, score_max=100, score_min=80):
+    """
+    Score of each artifact of a reviewer × artifact masked matrix with the normalizer
+    `method`, min-max scaled onto [score_min, score_max]; NaN where the normalizer has none.
+    """
+    values = NORMALIZERS[method](np.ma.masked_array(scores, dtype=float))
+    scored = ~np.isnan(values)
+    if scored.any():
+        values[scored] = scale_scores(values[scored], score_max, score_min)
+    return values
+
+
+def assignment_scores(assignment, method, score_max, score_min):
+    """
+    {artifact id: score} of an assignment with the normalizer `method`, None for artifacts
+    without a score. Ipsatization is served from its stored results, the other methods are
+    computed from the review score matrix.
+    """
+    if method == "ipsatization":
+        return ipsatization_scores(assignment, score_max, score_min)
+    _, artifact_ids, scores = review_score_matrix(assignment.id)
+    values = normalize(scores, method, score_max, score_min)
+    return {artifact_id: None if np.isnan(value) else float(value) for artifact_id, value in zip(artifact_ids, values)}
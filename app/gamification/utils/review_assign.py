@@ -0,0 +1,447 @@
+import random
+from collections import Counter
+
+import networkx as nx
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from app.gamification.models.artifact import Artifact
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.assignment import Assignment
+from app.gamification.models.membership import Membership
+from app.gamification.models.registration import Registration
+from app.gamification.models.reviewer_load import ReviewerLoad
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.utils.ipsatization import reviews_changed
+from app.gamification.utils.survey_tree import freeze_survey
+
+
+REVIEW_ASSIGN_STRATEGIES = {}
+
+
+def register_strategy(policy):
+    """
+    Register a reviewer assignment strategy for an `Assignment.ReviewerAssignPolicy`.
+
+    A strategy is called as `strategy(reviewers, artifacts, min_reviewers, seed=None)` where
+    `reviewers` is a list of (registration_id, entity_id) and `artifacts` a list of
+    (artifact_id, entity_id). It returns a list of (artifact_id, registration_id) pairs in
+    which every artifact gets `min_reviewers` distinct reviewers (or every eligible one if
+    there are fewer) and nobody reviews an artifact of their own entity.
+    """
+
+    def decorator(strategy):
+        REVIEW_ASSIGN_STRATEGIES[policy] = strategy
+        return strategy
+
+    return decorator
+
+
+def get_strategy(policy):
+    return REVIEW_ASSIGN_STRATEGIES.get(policy, REVIEW_ASSIGN_STRATEGIES[Assignment.ReviewerAssignPolicy.A])
+
+
+def _entity_sizes(reviewers):
+    return Counter(entity_id for _, entity_id in reviewers)
+
+
+def _ring_plan(reviewers, artifacts, min_reviewers):
+    """
+    Deal the reviewers out as a ring: artifacts take consecutive slices of the reviewer
+    list, wrapping around, so every reviewer ends up with the same number of reviews (+/- 1).
+    Slots where someone would review their own entity are then swapped with a slot of
+    another artifact, which keeps every reviewer's load unchanged. Slots no swap can fix
+    (uneven team sizes) go to the least loaded eligible reviewer.
+    """
+    entity_sizes = _entity_sizes(reviewers)
+    reviewer_num = len(reviewers)
+    slices = []
+    pointer = 0
+    for artifact_id, artifact_entity_id in artifacts:
+        need = min(min_reviewers, reviewer_num - entity_sizes[artifact_entity_id])
+        slots = [reviewers[(pointer + offset) % reviewer_num] for offset in range(need)]
+        pointer = (pointer + need) % reviewer_num
+        slices.append((artifact_id, artifact_entity_id, slots))
+
+    for index, (_, artifact_entity_id, slots) in enumerate(slices):
+        for position, (_, entity_id) in enumerate(slots):
+            if entity_id == artifact_entity_id:
+                _swap_self_review(slices, index, position)
+
+    kept = [[slot for slot in slots if slot[1] != artifact_entity_id] for _, artifact_entity_id, slots in slices]
+    loads = Counter(registration_id for slots in kept for registration_id, _ in slots)
+    plan = []
+    for (artifact_id, artifact_entity_id, slots), artifact_reviewers in zip(slices, kept):
+        for _ in range(len(slots) - len(artifact_reviewers)):
+            candidates = [
+                reviewer
+                for reviewer in reviewers
+                if reviewer[1] != artifact_entity_id and reviewer not in artifact_reviewers
+            ]
+            if not candidates:
+                break
+            reviewer = min(candidates, key=lambda candidate: loads[candidate[0]])
+            artifact_reviewers.append(reviewer)
+            loads[reviewer[0]] += 1
+        plan.extend((artifact_id, registration_id) for registration_id, _ in artifact_reviewers)
+    return plan
+
+
+def _swap_self_review(slices, index, position):
+    _, artifact_entity_id, slots = slices[index]
+    reviewer = slots[position]
+    for offset in range(1, len(slices)):
+        _, other_entity_id, other_slots = slices[(index + offset) % len(slices)]
+        if reviewer[1] == other_entity_id or reviewer in other_slots:
+            continue
+        for other_position, candidate in enumerate(other_slots):
+            if candidate[1] == artifact_entity_id or candidate in slots:
+                continue
+            slots[position], other_slots[other_position] = candidate, reviewer
+            return
+
+
+@register_strategy(Assignment.ReviewerAssignPolicy.A)
+def round_robin_plan(reviewers, artifacts, min_reviewers, seed=None):
+    if not reviewers or not artifacts or not min_reviewers:
+        return []
+    return _ring_plan(reviewers, artifacts, min_reviewers)
+
+
+@register_strategy(Assignment.ReviewerAssignPolicy.B)
+def random_balanced_plan(reviewers, artifacts, min_reviewers, seed=None):
+    if not reviewers or not artifacts or not min_reviewers:
+        return []
+    rng = random.Random(seed)
+    reviewers = list(reviewers)
+    artifacts = list(artifacts)
+    rng.shuffle(reviewers)
+    rng.shuffle(artifacts)
+    return _ring_plan(reviewers, artifacts, min_reviewers)
+
+
+@register_strategy(Assignment.ReviewerAssignPolicy.C)
+def min_cost_flow_plan(reviewers, artifacts, min_reviewers, seed=None):
+    """
+    Balanced assignment as a min-cost flow: source -> artifact -> reviewer -> sink.
+
+    Each artifact is only connected to a window of candidates around its position on the
+    reviewer ring, so the graph has O(artifacts * min_reviewers) edges. Every reviewer
+    takes `total // reviewers` reviews for free, one more at cost 1 and any further one
+    at a prohibitive cost, so the solver evens out loads the ring cannot (e.g. large teams).
+    Falls back to the ring when the windowed graph has no feasible flow.
+    """
+    if not reviewers or not artifacts or not min_reviewers:
+        return []
+    entity_sizes = _entity_sizes(reviewers)
+    reviewer_num = len(reviewers)
+    artifact_num = len(artifacts)
+
+    graph = nx.DiGraph()
+    total = 0
+    for index, (artifact_id, artifact_entity_id) in enumerate(artifacts):
+        eligible = reviewer_num - entity_sizes[artifact_entity_id]
+        need = min(min_reviewers, eligible)
+        if need == 0:
+            continue
+        total += need
+        window = min(eligible, 3 * need)
+        graph.add_edge("source", ("artifact", artifact_id), capacity=need, weight=0)
+        position = (index * reviewer_num) // artifact_num
+        candidates = 0
+        while candidates < window:
+            registration_id, entity_id = reviewers[position % reviewer_num]
+            position += 1
+            if entity_id == artifact_entity_id:
+                continue
+            graph.add_edge(("artifact", artifact_id), ("reviewer", registration_id), capacity=1, weight=0)
+            candidates += 1
+    if total == 0:
+        return []
+
+    base_load = total // reviewer_num
+    for registration_id, _ in reviewers:
+        node = ("reviewer", registration_id)
+        if node not in graph:
+            continue
+        if base_load > 0:
+            graph.add_edge(node, "sink", capacity=base_load, weight=0)
+        graph.add_edge(node, ("extra", registration_id), capacity=1, weight=1)
+        graph.add_edge(node, ("overflow", registration_id), capacity=total, weight=reviewer_num + 1)
+        graph.add_edge(("extra", registration_id), "sink", capacity=1, weight=0)
+        graph.add_edge(("overflow", registration_id), "sink", capacity=total, weight=0)
+    graph.nodes["source"]["demand"] = -total
+    graph.nodes["sink"]["demand"] = total
+
+    try:
+        _, flow = nx.network_simplex(graph)
+    except (nx.NetworkXUnfeasible, nx.NetworkXError):
+        return _ring_plan(reviewers, artifacts, min_reviewers)
+
+    plan = []
+    for artifact_id, _ in artifacts:
+        for (_, registration_id), amount in flow.get(("artifact", artifact_id), {}).items():
+            if amount > 0:
+                plan.append((artifact_id, registration_id))
+    return plan
+
+
+def load_assignment_candidates(assignment):
+    """
+    Load the artifacts of an assignment and the students allowed to review them.
+
+    Only students whose entity submitted an artifact take part in the review round.
+    Returns (reviewers, artifacts) in the shape expected by the strategies.
+    """
+    artifacts = list(
+        Artifact.objects.filter(assignment=assignment).order_by("id").values_list("id", "entity_id")
+    )
+    entity_ids = {entity_id for _, entity_id in artifacts}
+    memberships = (
+        Membership.objects.filter(
+            entity_id__in=entity_ids, student__course_id=assignment.course_id, student__user__is_staff=False
+        )
+        .order_by("student_id", "id")
+        .values_list("student_id", "entity_id")
+    )
+    reviewers = {}
+    for registration_id, entity_id in memberships:
+        reviewers.setdefault(registration_id, entity_id)
+    return list(reviewers.items()), artifacts
+
+
+def write_review_plan(assignment, plan):
+    """
+    Persist a review plan with a single bulk insert, skipping pairs that already exist.
+    Returns the number of artifact reviews created.
+    """
+    existing = set(
+        ArtifactReview.objects.filter(artifact__assignment=assignment).values_list("artifact_id", "user_id")
+    )
+    artifact_reviews = [
+        ArtifactReview(
+            artifact_id=artifact_id, user_id=registration_id, status=ArtifactReview.ArtifactReviewType.INCOMPLETE
+        )
+        for artifact_id, registration_id in plan
+        if (artifact_id, registration_id) not in existing
+    ]
+    ArtifactReview.objects.bulk_create(artifact_reviews, ignore_conflicts=True)
+    return len(artifact_reviews)
+
+
+def rebuild_reviewer_loads(assignment, registration_ids=()):
+    """
+    Recount the reviewer-load index of an assignment from its artifact reviews.
+    `registration_ids` are eligible reviewers that get a row even without any review yet.
+    """
+    counts = dict(
+        ArtifactReview.objects.filter(artifact__assignment=assignment)
+        .order_by()
+        .values_list("user_id")
+        .annotate(count=Count("id"))
+    )
+    for registration_id in registration_ids:
+        counts.setdefault(registration_id, 0)
+    ReviewerLoad.objects.filter(assignment=assignment).delete()
+    ReviewerLoad.objects.bulk_create(
+        [
+            ReviewerLoad(assignment=assignment, registration_id=registration_id, review_count=count)
+            for registration_id, count in counts.items()
+        ]
+    )
+
+
+def adjust_reviewer_load(assignment_id, registration_ids, delta):
+    """
+    Keep the reviewer-load index in step with reviews added (delta=1) or removed (delta=-1)
+    for the given registrations.
+    """
+    registration_ids = list(registration_ids)
+    if not registration_ids:
+        return
+    ReviewerLoad.objects.filter(assignment_id=assignment_id, registration_id__in=registration_ids).update(
+        review_count=F("review_count") + delta
+    )
+    # Only extend an index that has been built, an empty one is rebuilt from scratch on first use
+    if delta > 0 and ReviewerLoad.objects.filter(assignment_id=assignment_id).exists():
+        ReviewerLoad.objects.bulk_create(
+            [
+                ReviewerLoad(assignment_id=assignment_id, registration_id=registration_id, review_count=delta)
+                for registration_id in registration_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def delete_artifact_reviews(artifact_reviews):
+    """
+    Delete the artifact reviews of a queryset and keep what is derived from them in step:
+    the completed review count of their artifacts, the reviewer-load index and the stored
+    ipsatization results of their assignments. Returns the number of artifact reviews deleted.
+    """
+    with transaction.atomic():
+        rows = list(
+            artifact_reviews.select_for_update(of=("self",)).values_list(
+                "id", "artifact_id", "artifact__assignment_id", "user_id", "status"
+            )
+        )
+        if not rows:
+            return 0
+        ArtifactReview.objects.filter(id__in=[row[0] for row in rows]).delete()
+
+        completed = Counter(
+            artifact_id
+            for _, artifact_id, _, _, status in rows
+            if status == ArtifactReview.ArtifactReviewType.COMPLETED
+        )
+        for artifact_id, count in completed.items():
+            Artifact.objects.filter(id=artifact_id).update(completed_review_count=F("completed_review_count") - count)
+        # Registrations losing the same number of reviews of an assignment share one update
+        reviews_per_reviewer = Counter((assignment_id, user_id) for _, _, assignment_id, user_id, _ in rows)
+        reviewers_per_count = {}
+        for (assignment_id, user_id), count in reviews_per_reviewer.items():
+            reviewers_per_count.setdefault((assignment_id, count), []).append(user_id)
+        for (assignment_id, count), registration_ids in reviewers_per_count.items():
+            adjust_reviewer_load(assignment_id, registration_ids, -count)
+        reviewers_per_assignment = {}
+        for assignment_id, user_id in reviews_per_reviewer:
+            reviewers_per_assignment.setdefault(assignment_id, []).append(user_id)
+        for assignment_id, registration_ids in reviewers_per_assignment.items():
+            reviews_changed(assignment_id, registration_ids)
+    return len(rows)
+
+
+def _build_plan(assignment, reviewers, artifacts, policy, seed):
+    policy = policy or assignment.review_assign_policy
+    seed = assignment.id if seed is None else seed
+    return get_strategy(policy)(reviewers, artifacts, assignment.min_reviewers or 0, seed=seed)
+
+
+def plan_reviews(assignment, policy=None, seed=None):
+    """
+    Build the review plan of an assignment with the strategy of its `review_assign_policy`
+    without writing anything. The seed defaults to the assignment id so that a preview and
+    the real assignment produce the same plan.
+    """
+    reviewers, artifacts = load_assignment_candidates(assignment)
+    return _build_plan(assignment, reviewers, artifacts, policy, seed)
+
+
+def preview_review_plan(assignment, policy=None, seed=None):
+    """
+    Dry run of `assign_reviews`: the plan plus how evenly it spreads the reviews.
+    """
+    plan = plan_reviews(assignment, policy=policy, seed=seed)
+    reviews_per_reviewer = Counter(registration_id for _, registration_id in plan)
+    reviewers_per_artifact = Counter(artifact_id for artifact_id, _ in plan)
+    return {
+        "policy": policy or assignment.review_assign_policy,
+        "pairs": plan,
+        "reviews_per_reviewer": dict(reviews_per_reviewer),
+        "reviewers_per_artifact": dict(reviewers_per_artifact),
+    }
+
+
+def assign_reviews(assignment, policy=None, seed=None):
+    reviewers, artifacts = load_assignment_candidates(assignment)
+    plan = _build_plan(assignment, reviewers, artifacts, policy, seed)
+    created = write_review_plan(assignment, plan)
+    rebuild_reviewer_loads(assignment, [registration_id for registration_id, _ in reviewers])
+    return created
+
+
+def assign_late_artifact(artifact):
+    """
+    Top up the reviewers of an artifact submitted after its survey was released.
+
+    Only the missing `min_reviewers` are added, taken from the least loaded eligible
+    registrations of the reviewer-load index, so the cost does not depend on the course size.
+    The uploaders join the index so they can review later submissions.
+    Returns the number of artifact reviews created.
+    """
+    assignment = artifact.assignment
+    with transaction.atomic():
+        if not ReviewerLoad.objects.filter(assignment=assignment).exists():
+            reviewers, _ = load_assignment_candidates(assignment)
+            rebuild_reviewer_loads(assignment, [registration_id for registration_id, _ in reviewers])
+
+        member_ids = list(
+            Membership.objects.filter(entity_id=artifact.entity_id, student__user__is_staff=False).values_list(
+                "student_id", flat=True
+            )
+        )
+        existing_ids = list(ArtifactReview.objects.filter(artifact=artifact).values_list("user_id", flat=True))
+        need = (assignment.min_reviewers or 0) - len(existing_ids)
+        reviewer_ids = []
+        if need > 0:
+            reviewer_ids = list(
+                ReviewerLoad.objects.filter(assignment=assignment)
+                .exclude(registration_id__in=member_ids + existing_ids)
+                .order_by("review_count", "registration_id")
+                .values_list("registration_id", flat=True)[:need]
+            )
+            ArtifactReview.objects.bulk_create(
+                [
+                    ArtifactReview(
+                        artifact=artifact, user_id=registration_id, status=ArtifactReview.ArtifactReviewType.INCOMPLETE
+                    )
+                    for registration_id in reviewer_ids
+                ],
+                ignore_conflicts=True,
+            )
+            ReviewerLoad.objects.filter(assignment=assignment, registration_id__in=reviewer_ids).update(
+                review_count=F("review_count") + 1
+            )
+        ReviewerLoad.objects.bulk_create(
+            [ReviewerLoad(assignment=assignment, registration_id=registration_id) for registration_id in member_ids],
+            ignore_conflicts=True,
+        )
+    return len(reviewer_ids)
+
+
+def assign_team_artifact(artifact):
+    """
+    Let every student of the course outside the uploading team review a team artifact.
+
+    Set based: one query for the eligible registrations, one for the existing reviewers
+    and one bulk insert, whatever the size of the course.
+    Returns the number of artifact reviews created.
+    """
+    eligible_ids = set(
+        Registration.objects.filter(course_id=artifact.entity.course_id, user__is_staff=False)
+        .exclude(membership__entity_id=artifact.entity_id)
+        .values_list("id", flat=True)
+    )
+    existing_ids = set(ArtifactReview.objects.filter(artifact=artifact).values_list("user_id", flat=True))
+    new_ids = sorted(eligible_ids - existing_ids)
+    ArtifactReview.objects.bulk_create(
+        [ArtifactReview(artifact=artifact, user_id=registration_id) for registration_id in new_ids],
+        ignore_conflicts=True,
+    )
+    adjust_reviewer_load(artifact.assignment_id, new_ids, 1)
+    return len(new_ids)
+
+
+def assign_due_surveys(now=None):
+    """
+    Release every survey whose release date has passed and assign its reviews.
+
+    Each survey is claimed with a conditional UPDATE on `is_released`, so concurrent
+    callers (several web nodes, cron overlap) never assign the same survey twice.
+    The claim, the survey snapshot and the review rows are committed in one transaction.
+    Returns {survey_id: number of artifact reviews created}.
+    """
+    now = now or timezone.now()
+    due_surveys = FeedbackSurvey.objects.filter(
+        is_released=False, date_released__lte=now, assignment__isnull=False
+    ).select_related("assignment")
+    result = {}
+    for survey in due_surveys:
+        with transaction.atomic():
+            claimed = FeedbackSurvey.objects.filter(id=survey.id, is_released=False).update(is_released=True)
+            if not claimed:
+                continue
+            freeze_survey(survey)
+            result[survey.id] = assign_reviews(survey.assignment)
+    return result
@@ -0,0 +1,71 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.utils.inbox import reviewee_label
+
+MATRIX_FIELDS = (
+    "id",
+    "artifact",
+    "user",
+    "status",
+    "max_artifact_review_score",
+    "artifact_review_score",
+    "reviewer",
+    "reviewing",
+    "assignment_type",
+    "course_id",
+    "course_number",
+    "assignment_id",
+)
+MAX_PAGE_SIZE = 1000
+
+
+def review_matrix(assignment_id):
+    """
+    Every artifact review of an assignment with the reviewer and reviewee labels resolved
+    by the database, ordered by id for keyset pagination.
+    """
+    return (
+        ArtifactReview.objects.filter(artifact__assignment_id=assignment_id)
+        .annotate(
+            reviewer=F("user__user__andrew_id"),
+            reviewing=reviewee_label(),
+            assignment_type=F("artifact__assignment__assignment_type"),
+            course_id=F("artifact__assignment__course_id"),
+            course_number=F("artifact__assignment__course__course_number"),
+            assignment_id=F("artifact__assignment_id"),
+        )
+        .order_by("id")
+        .values(*MATRIX_FIELDS)
+    )
+
+
+def review_matrix_page(assignment_id, after=None, limit=None):
+    """
+    Keyset page of the review matrix: the rows with an id greater than `after`.
+    Returns (rows, cursor of the next page or None).
+    """
+    rows = review_matrix(assignment_id)
+    if after is not None:
+        rows = rows.filter(id__gt=after)
+    if limit is None:
+        return list(rows), None
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = list(rows[: limit + 1])
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1]["id"]
+    return rows, None
+
+
+def stream_review_matrix(assignment_id, after=None):
+    """
+    The review matrix as JSON lines, read from the database in chunks.
+    """
+    rows = review_matrix(assignment_id)
+    if after is not None:
+        rows = rows.filter(id__gt=after)
+    for row in rows.iterator(chunk_size=MAX_PAGE_SIZE):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
@@ -0,0 +1,110 @@
+import numpy as np
+from django.db import transaction
+
+from app.gamification.models.answer import Answer
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.question import Question
+from app.gamification.utils.ipsatization import reviews_changed
+from app.gamification.utils.survey_tree import published_questions
+
+# Points of a fully positive answer; review scores are stored as integers
+QUESTION_POINTS = 100
+
+
+def _scale_position(question, answer_text):
+    labels = Question.SCALE_LABELS.get(question.number_of_scale, [])
+    if answer_text in labels:
+        return labels.index(answer_text), 0, len(labels) - 1
+    # Scales without labels are answered with 1..number_of_scale
+    return float(answer_text) - 1, 0, question.number_of_scale - 1
+
+
+def _position(question, option_choice_id, answer_text):
+    """
+    (value, lowest, highest) of an answer on its question's scale, None if it isn't scored.
+    """
+    if question.question_type == Question.QuestionType.SCALEMULTIPLECHOICE:
+        return _scale_position(question, answer_text)
+    if question.question_type == Question.QuestionType.NUMBER:
+        return float(answer_text), question.min, question.max
+    if question.question_type == Question.QuestionType.MULTIPLECHOICE:
+        option_ids = [option_choice.pk for option_choice in question.option_list]
+        return option_ids.index(option_choice_id), 0, len(option_ids) - 1
+    return None
+
+
+def score_answers(questions, answers):
+    """
+    Score reviews from their answers in one vectorized pass.
+
+    `questions` is {question pk: question} of the published survey, `answers` an iterable of
+    (artifact review id, question id, option choice id, answer text). Scale, number and
+    multiple choice answers are placed between 0 and 1 on their question's range (scale
+    labels, `min`/`max`, option order), flipped for negatively phrased questions, and worth
+    up to QUESTION_POINTS each.
+
+    Returns {artifact review id: (score, max score)} for the reviews with a scored answer.
+    """
+    review_ids, values, lows, highs, positive = [], [], [], [], []
+    for artifact_review_id, question_id, option_choice_id, answer_text in answers:
+        question = questions.get(question_id)
+        if question is None:
+            continue
+        try:
+            position = _position(question, option_choice_id, answer_text)
+        except (TypeError, ValueError):
+            continue
+        if position is None or position[1] is None or position[2] is None or position[2] <= position[1]:
+            continue
+        review_ids.append(artifact_review_id)
+        values.append(position[0])
+        lows.append(position[1])
+        highs.append(position[2])
+        positive.append(question.phrased_positively)
+    if not review_ids:
+        return {}
+
+    values, lows, highs = np.array(values, dtype=float), np.array(lows, dtype=float), np.array(highs, dtype=float)
+    scores = np.clip((values - lows) / (highs - lows), 0, 1)
+    scores = np.where(np.array(positive, dtype=bool), scores, 1 - scores)
+    reviews, inverse = np.unique(np.array(review_ids), return_inverse=True)
+    totals = np.rint(np.bincount(inverse, weights=scores) * QUESTION_POINTS).astype(int)
+    counts = np.bincount(inverse) * QUESTION_POINTS
+    return {int(review): (int(total), int(count)) for review, total, count in zip(reviews, totals, counts)}
+
+
+def score_review(artifact_review, questions, answers):
+    """
+    Set the score of `artifact_review` from its unsaved answers (see `build_answers`),
+    both scores stay None when none of the answers is scored.
+    """
+    rows = [(artifact_review.pk, answer.question_id, answer.option_choice_id, answer.answer_text) for answer in answers]
+    score, max_score = score_answers(questions, rows).get(artifact_review.pk, (None, None))
+    artifact_review.artifact_review_score = score
+    artifact_review.max_artifact_review_score = max_score
+
+
+@transaction.atomic
+def rescore_assignment(assignment):
+    """
+    Recompute the scores of all completed reviews of `assignment` against its published survey,
+    with one query for the answers and one bulk update. Returns the number of reviews updated.
+    """
+    questions = published_questions(assignment.survey)
+    reviews = list(
+        ArtifactReview.objects.filter(
+            artifact__assignment=assignment, status=ArtifactReview.ArtifactReviewType.COMPLETED
+        ).only("id", "artifact_review_score", "max_artifact_review_score")
+    )
+    answers = Answer.objects.filter(
+        artifact_review__artifact__assignment=assignment,
+        artifact_review__status=ArtifactReview.ArtifactReviewType.COMPLETED,
+    ).values_list(
+        "artifact_review_id", "option_choice__question_id", "option_choice_id", "answer_text"
+    )
+    scores = score_answers(questions, answers)
+    for review in reviews:
+        review.artifact_review_score, review.max_artifact_review_score = scores.get(review.pk, (None, None))
+    ArtifactReview.objects.bulk_update(reviews, ["artifact_review_score", "max_artifact_review_score"], batch_size=1000)
+    reviews_changed(assignment.id)
+    return len(reviews)
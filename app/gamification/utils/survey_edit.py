@@ -0,0 +1,200 @@
+import copy
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models.base import ModelState
+
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.option_choice import OptionChoice
+from app.gamification.models.question import Question
+from app.gamification.models.survey_section import SurveySection
+from app.gamification.utils.db import bulk_create_with_pks
+
+SECTION_FIELDS = ["title", "is_required"]
+QUESTION_FIELDS = [
+    "text",
+    "is_required",
+    "question_type",
+    "phrased_positively",
+    "gamified",
+    "number_of_scale",
+    "number_of_text",
+    "min",
+    "max",
+]
+
+
+def survey_is_locked(survey):
+    """
+    Whether the structure of `survey` can no longer change, i.e. a review of its assignment
+    has been completed against it. A single EXISTS on `artifact_review_status_idx`.
+    """
+    return ArtifactReview.objects.filter(
+        artifact__assignment_id=survey.assignment_id, status=ArtifactReview.ArtifactReviewType.COMPLETED
+    ).exists()
+
+
+def _pk(item):
+    try:
+        return int(item.get("pk"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _kept_pks(items, existing):
+    """
+    pks of the incoming items that keep their row.
+
+    Sections, questions and options are displayed in pk order, so a row is only kept while
+    the incoming pks are increasing. From the first new or reordered item on, the rest of the
+    list is recreated, which gives the new rows increasing pks in the incoming order.
+    """
+    kept = []
+    for item in items:
+        pk = _pk(item)
+        if pk not in existing or (kept and pk <= kept[-1]):
+            break
+        kept.append(pk)
+    return set(kept)
+
+
+def _default(field):
+    return Question._meta.get_field(field).default
+
+
+def _set_question_fields(question, data):
+    question.text = data["text"]
+    question.is_required = data["is_required"]
+    question.question_type = data["question_type"]
+    question.phrased_positively = data["phrased_positively"]
+    question.gamified = data["gamified"]
+    question.number_of_scale = (
+        data["number_of_scale"]
+        if data["question_type"] == Question.QuestionType.SCALEMULTIPLECHOICE
+        else _default("number_of_scale")
+    )
+    question.number_of_text = (
+        data["number_of_text"]
+        if data["question_type"] == Question.QuestionType.MULTIPLETEXT
+        else _default("number_of_text")
+    )
+    if data["question_type"] == Question.QuestionType.NUMBER:
+        question.min = data.get("min", 0)
+        question.max = data.get("max", 100)
+    else:
+        question.min = _default("min")
+        question.max = _default("max")
+
+
+def _option_texts(data):
+    """
+    Multiple choice and multiple select questions keep their option choices,
+    other question types have a single option without text that answers point to.
+    """
+    if data["question_type"] in (Question.QuestionType.MULTIPLECHOICE, Question.QuestionType.MULTIPLESELECT):
+        return data["option_choices"]
+    return [{"text": ""}]
+
+
+@transaction.atomic
+def apply_survey_edit(survey, sections_data):
+    """
+    Bring the contents of a survey in line with `sections_data`, the nested sections /
+    questions / option choices sent by the survey editor.
+
+    Rows are matched by pk: matched rows are updated, missing rows deleted and new rows
+    created, each kind with one bulk statement per table. Unchanged rows keep their pk,
+    and with it the answers already given to them.
+    """
+    sections = {section.pk: section for section in SurveySection.objects.filter(survey=survey)}
+    questions = {question.pk: question for question in Question.objects.filter(section__survey=survey)}
+    options = defaultdict(dict)
+    for option_choice in OptionChoice.objects.filter(question__section__survey=survey):
+        options[option_choice.question_id][option_choice.pk] = option_choice
+
+    # Sections
+    kept_sections = _kept_pks(sections_data, sections)
+    section_plan = []
+    for data in sections_data:
+        section = sections[_pk(data)] if _pk(data) in kept_sections else SurveySection(survey=survey)
+        section.title = data["title"]
+        section.is_required = data["is_required"]
+        section_plan.append((section, data))
+    SurveySection.objects.bulk_update([sections[pk] for pk in kept_sections], SECTION_FIELDS)
+    bulk_create_with_pks(SurveySection, [section for section, _ in section_plan if section.pk is None])
+
+    # Questions, only kept within the section they already belong to
+    kept_questions = set()
+    question_plan = []
+    for section, data in section_plan:
+        section_questions = {pk: question for pk, question in questions.items() if question.section_id == section.pk}
+        kept = _kept_pks(data["questions"], section_questions)
+        kept_questions |= kept
+        for question_data in data["questions"]:
+            question = questions[_pk(question_data)] if _pk(question_data) in kept else Question(section=section)
+            _set_question_fields(question, question_data)
+            question_plan.append((question, question_data))
+    Question.objects.bulk_update([questions[pk] for pk in kept_questions], QUESTION_FIELDS)
+    bulk_create_with_pks(Question, [question for question, _ in question_plan if question.pk is None])
+
+    # Option choices
+    kept_options = set()
+    updated_options = []
+    new_options = []
+    for question, data in question_plan:
+        texts = _option_texts(data)
+        question_options = options.get(question.pk, {})
+        if data["question_type"] in (Question.QuestionType.MULTIPLECHOICE, Question.QuestionType.MULTIPLESELECT):
+            kept = _kept_pks(texts, question_options)
+        else:
+            # Keep the first option of the question as its blank option
+            kept = set(sorted(question_options)[:1])
+            texts = [{"pk": pk, "text": ""} for pk in kept] or texts
+        kept_options |= kept
+        for option_data in texts:
+            if _pk(option_data) in kept:
+                option_choice = question_options[_pk(option_data)]
+                option_choice.text = option_data["text"]
+                updated_options.append(option_choice)
+            else:
+                new_options.append(OptionChoice(question=question, text=option_data["text"]))
+    OptionChoice.objects.bulk_update(updated_options, ["text"])
+    OptionChoice.objects.bulk_create(new_options)
+
+    # Deletions cascade to the children and to the answers pointing at them
+    removed_options = [pk for question_options in options.values() for pk in question_options if pk not in kept_options]
+    OptionChoice.objects.filter(pk__in=removed_options).delete()
+    Question.objects.filter(pk__in=[pk for pk in questions if pk not in kept_questions]).delete()
+    SurveySection.objects.filter(pk__in=[pk for pk in sections if pk not in kept_sections]).delete()
+
+
+def _copy(obj, **fields):
+    clone = copy.copy(obj)
+    clone.pk = None
+    clone._state = ModelState()
+    for field, value in fields.items():
+        setattr(clone, field, value)
+    return clone
+
+
+@transaction.atomic
+def clone_survey_tree(template, survey):
+    """
+    Copy the sections, questions and option choices of `template` into `survey`.
+
+    The tree is read in three queries and written with one `bulk_create` per table,
+    foreign keys are remapped in memory from the template pks to the created rows.
+    """
+    sections = list(SurveySection.objects.filter(survey=template).order_by("pk"))
+    questions = list(Question.objects.filter(section__survey=template).order_by("pk"))
+    options = list(OptionChoice.objects.filter(question__section__survey=template).order_by("pk"))
+
+    new_sections = {section.pk: _copy(section, survey=survey) for section in sections}
+    bulk_create_with_pks(SurveySection, new_sections.values())
+    new_questions = {
+        question.pk: _copy(question, section=new_sections[question.section_id]) for question in questions
+    }
+    bulk_create_with_pks(Question, new_questions.values())
+    OptionChoice.objects.bulk_create(
+        _copy(option_choice, question=new_questions[option_choice.question_id]) for option_choice in options
+    )
@@ -0,0 +1,49 @@
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from app.gamification.models.artifact_review import ArtifactReview
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.utils.review_assign import assign_due_surveys
+
+# Statuses of reviews still owed by the reviewer, they become LATE once the survey is due
+PENDING_STATUSES = [
+    ArtifactReview.ArtifactReviewType.INCOMPLETE,
+    ArtifactReview.ArtifactReviewType.OPTIONAL_INCOMPLETE,
+]
+
+
+def release_due_surveys(now=None):
+    """
+    Release every survey whose release date has passed and assign its reviews.
+    Returns {survey_id: number of artifact reviews created}.
+    """
+    return assign_due_surveys(now)
+
+
+def mark_late_reviews(now=None):
+    """
+    Mark LATE, in a single UPDATE, the pending reviews of every assignment whose current
+    survey, the latest one as in `Assignment.survey`, is past its due date.
+    Returns the number of reviews marked.
+    """
+    now = now or timezone.now()
+    survey = FeedbackSurvey.objects.filter(assignment_id=OuterRef("artifact__assignment_id")).order_by("-id")
+    return (
+        ArtifactReview.objects.filter(status__in=PENDING_STATUSES)
+        .annotate(date_due=Subquery(survey.values("date_due")[:1]))
+        .filter(date_due__lt=now)
+        .update(status=ArtifactReview.ArtifactReviewType.LATE)
+    )
+
+
+def run_survey_lifecycle(now=None):
+    """
+    Apply every survey transition that is due at `now`.
+
+    Each transition is a conditional UPDATE that only matches rows still in their old state,
+    so running it twice, or on several nodes at once, applies every transition exactly once.
+    """
+    now = now or timezone.now()
+    released = release_due_surveys(now)
+    late = mark_late_reviews(now)
+    return {"released": released, "late": late}
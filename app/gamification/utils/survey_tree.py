@@ -0,0 +1,180 @@
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.db.models import F, Prefetch
+from django.utils.http import parse_etags, quote_etag
+
+from app.gamification.models.option_choice import OptionChoice
+from app.gamification.models.question import Question
+from app.gamification.models.survey import FeedbackSurvey
+from app.gamification.models.survey_section import SurveySection
+
+SURVEY_TREE_TIMEOUT = 24 * 60 * 60  # 1 day
+
+
+def bump_survey_version(survey_id):
+    """
+    Mark a survey as edited: cached trees and ETags of the previous version are no longer used.
+    """
+    FeedbackSurvey.objects.filter(id=survey_id).update(version=F("version") + 1)
+
+
+def survey_etag(survey):
+    return quote_etag(f"survey-{survey.pk}-v{survey.version}")
+
+
+def survey_not_modified(request, etag):
+    """
+    True when the client already holds this version of the survey (If-None-Match).
+    """
+    etags = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+    return etag in etags or "*" in etags
+
+
+def _query_survey_tree(survey):
+    options = Prefetch("optionchoice_set", queryset=OptionChoice.objects.order_by("pk"), to_attr="option_list")
+    questions = Prefetch(
+        "question_set",
+        queryset=Question.objects.order_by("pk").prefetch_related(options),
+        to_attr="question_list",
+    )
+    return list(SurveySection.objects.filter(survey=survey).order_by("pk").prefetch_related(questions))
+
+
+def load_survey_tree(survey):
+    """
+    Load the sections of a survey with their questions and option choices.
+
+    Sections come ordered by pk with their questions in `question_list`, each question with
+    its option choices in `option_list`, both ordered by pk as the model properties are.
+    The tree is cached per survey version, a cache miss costs three queries.
+    """
+    key = f"survey-tree:{survey.pk}:{survey.version}"
+    return cache.get_or_set(key, lambda: _query_survey_tree(survey), SURVEY_TREE_TIMEOUT)
+
+
+SNAPSHOT_SECTION_FIELDS = ("pk", "title", "description", "is_required")
+SNAPSHOT_QUESTION_FIELDS = (
+    "pk",
+    "text",
+    "is_required",
+    "question_type",
+    "number_of_scale",
+    "number_of_text",
+    "gamified",
+    "phrased_positively",
+    "min",
+    "max",
+)
+
+
+def build_survey_snapshot(survey):
+    """
+    JSON structure of a survey: its sections, questions (with their scale and range metadata)
+    and option choices.
+    """
+    return [
+        {
+            **{field: getattr(section, field) for field in SNAPSHOT_SECTION_FIELDS},
+            "questions": [
+                {
+                    **{field: getattr(question, field) for field in SNAPSHOT_QUESTION_FIELDS},
+                    "option_choices": [
+                        {"pk": option_choice.pk, "text": option_choice.text} for option_choice in question.option_list
+                    ],
+                }
+                for question in section.question_list
+            ],
+        }
+        for section in _query_survey_tree(survey)
+    ]
+
+
+def freeze_survey(survey):
+    """
+    Store the current structure of a survey in its snapshot, read by reviewers from then on.
+    """
+    survey.snapshot = build_survey_snapshot(survey)
+    FeedbackSurvey.objects.filter(id=survey.id).update(snapshot=survey.snapshot)
+
+
+def _tree_from_snapshot(snapshot):
+    return [
+        SimpleNamespace(
+            **{field: section[field] for field in SNAPSHOT_SECTION_FIELDS},
+            question_list=[
+                SimpleNamespace(
+                    **{field: question[field] for field in SNAPSHOT_QUESTION_FIELDS},
+                    option_list=[SimpleNamespace(**option_choice) for option_choice in question["option_choices"]],
+                )
+                for question in section["questions"]
+            ],
+        )
+        for section in snapshot
+    ]
+
+
+def load_published_survey_tree(survey):
+    """
+    The survey tree reviewers work with: the snapshot frozen at release, the live tables before.
+    Same shape as `load_survey_tree`.
+    """
+    if survey.snapshot is not None:
+        return _tree_from_snapshot(survey.snapshot)
+    return load_survey_tree(survey)
+
+
+def published_questions(survey):
+    """
+    {question pk: question} of the published survey tree, for validating submitted answers.
+    """
+    if survey is None:
+        return {}
+    return {
+        question.pk: question for section in load_published_survey_tree(survey) for question in section.question_list
+    }
+
+
+def option_choices_data(question):
+    return [{"pk": option_choice.pk, "text": option_choice.text} for option_choice in question.option_list]
+
+
+def question_data(question):
+    """
+    Question of a survey template, as shown to instructors and to students filling the survey.
+    """
+    curr_question = dict()
+    curr_question["pk"] = question.pk
+    curr_question["text"] = question.text
+    curr_question["is_required"] = question.is_required
+    curr_question["phrased_positively"] = question.phrased_positively
+    curr_question["gamified"] = question.gamified
+    curr_question["question_type"] = question.question_type
+    if (
+        question.question_type == Question.QuestionType.MULTIPLECHOICE
+        or question.question_type == Question.QuestionType.MULTIPLESELECT
+    ):
+        curr_question["option_choices"] = option_choices_data(question)
+    elif question.question_type == Question.QuestionType.SCALEMULTIPLECHOICE:
+        curr_question["number_of_scale"] = question.number_of_scale
+    else:
+        curr_question["number_of_text"] = question.number_of_text
+    return curr_question
+
+
+def survey_sections_data(survey, question_data=question_data, published=False):
+    """
+    Nested sections and questions of a survey, built from `load_survey_tree`, or from
+    `load_published_survey_tree` when `published` is set.
+    `question_data` renders a single question, views add their answers through it.
+    """
+    tree = load_published_survey_tree(survey) if published else load_survey_tree(survey)
+    sections = []
+    for section in tree:
+        curr_section = dict()
+        curr_section["pk"] = section.pk
+        curr_section["title"] = section.title
+        curr_section["is_required"] = section.is_required
+        curr_section["questions"] = [question_data(question) for question in section.question_list]
+        sections.append(curr_section)
+    return sections
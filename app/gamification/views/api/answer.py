@@ -9,14 +9,16 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, permissions
 from rest_framework.response import Response
 
-from app.gamification.models.answer import Answer, ArtifactFeedback
+from app.gamification.models.answer import Answer
 from app.gamification.models.artifact import Artifact
 from app.gamification.models.artifact_review import ArtifactReview
 from app.gamification.models.assignment import Assignment
 from app.gamification.models.option_choice import OptionChoice
 from app.gamification.models.question import Question
 from app.gamification.serializers.answer import AnswerSerializer
+from app.gamification.utils.answers import answers_by_question, question_answers
 from app.gamification.utils.s3 import generate_presigned_url
+from app.gamification.utils.survey_tree import option_choices_data, survey_sections_data
 
 
 class ArtifactAnswerKeywordList(generics.ListCreateAPIView):
@@ -94,18 +96,6 @@ class ArtifactAnswerMultipleChoiceList(generics.ListCreateAPIView):
             answers.extend(answer)
 
         choice_labels = set()
-        scale_list_7 = [
-            "strongly disagree",
-            "disagree",
-            "weakly disagree",
-            "neutral",
-            "weakly agree",
-            "agree",
-            "strongly agree",
-        ]
-        scale_list_5 = ["strongly disagree", "disagree", "neutral", "agree", "strongly agree"]
-        scale_list_3 = ["disagree", "neutral", "agree"]
-        number_of_scale_dict = {3: scale_list_3, 5: scale_list_5, 7: scale_list_7}
         result = {
             "sections": {},
         }
@@ -126,7 +116,7 @@ class ArtifactAnswerMultipleChoiceList(generics.ListCreateAPIView):
                     choice_labels = [option_choice.text for option_choice in option_choices]
                 elif question_type == Question.QuestionType.SCALEMULTIPLECHOICE:
                     number_of_scale = answer.option_choice.question.number_of_scale
-                    choice_labels = number_of_scale_dict[number_of_scale]
+                    choice_labels = Question.SCALE_LABELS[number_of_scale]
                 # Check if section_title in sections
                 if section_title not in result["sections"]:
                     result["sections"][section_title] = {}
@@ -162,9 +152,12 @@ class ArtifactAnswerDetail(generics.GenericAPIView):
         },
     )
     def get(self, request, course_id, assignment_id, artifact_pk, *args, **kwargs):
-        artifacts_reviews = ArtifactReview.objects.filter(
-            artifact_id=artifact_pk, status=ArtifactReview.ArtifactReviewType.COMPLETED
+        artifact_review_ids = list(
+            ArtifactReview.objects.filter(
+                artifact_id=artifact_pk, status=ArtifactReview.ArtifactReviewType.COMPLETED
+            ).values_list("id", flat=True)
         )
+        answers = answers_by_question(artifact_review_ids)
         assignment = get_object_or_404(Assignment, id=assignment_id)
         survey_template = assignment.survey
         data = dict()
@@ -173,65 +166,42 @@ class ArtifactAnswerDetail(generics.GenericAPIView):
         data["artifact_pk"] = artifact_pk
         artifact = Artifact.objects.get(id=artifact_pk)
         data["instructions"] = survey_template.instructions
-        data["sections"] = []
-        for section in survey_template.sections:
-            curr_section = dict()
-            curr_section["pk"] = section.pk
-            curr_section["title"] = section.title
-            curr_section["is_required"] = section.is_required
-            curr_section["questions"] = []
-            for question in section.questions:
-                curr_question = dict()
-                curr_question["pk"] = question.pk
-                curr_question["text"] = question.text
-                curr_question["is_required"] = question.is_required
-                curr_question["question_type"] = question.question_type
-                curr_question["phrased_positively"] = question.phrased_positively
-                curr_question["gamified"] = False
-                curr_question["artifact_reviews"] = []
-                for completed_artifact_review in artifacts_reviews:
-                    answer_filter = {
-                        "artifact_review_id": completed_artifact_review.pk,
-                        "option_choice__question": question,
-                    }
-                    answers = (
-                        Answer.objects.filter(**answer_filter)
-                        if question.question_type != Question.QuestionType.SLIDEREVIEW
-                        else ArtifactFeedback.objects.filter(**answer_filter)
-                    )
-                    curr_question["artifact_reviews"].append([])
-                    for answer in answers:
-                        answer_data = {}
-                        answer_data["page"] = (
-                            answer.page if question.question_type == Question.QuestionType.SLIDEREVIEW else None
-                        )
-                        answer_data["text"] = answer.answer_text
-                        answer_data["artifact_review_id"] = completed_artifact_review.pk
-                        reviewer_registration = completed_artifact_review.user
-                        answer_data["artifact_reviewer_id"] = reviewer_registration.user.pk
-                        curr_question["artifact_reviews"][-1].append(answer_data)
-                if question.question_type == Question.QuestionType.SLIDEREVIEW:
-                    key = artifact.file.name
-                    path = f"http://{settings.ALLOWED_HOSTS[2]}:8000{artifact.file.url}"
-
-                    if settings.USE_S3:
-                        path = generate_presigned_url(key, http_method="GET")
-                    curr_question["file_path"] = path
-                if (
-                    question.question_type == Question.QuestionType.MULTIPLECHOICE
-                    or question.question_type == Question.QuestionType.MULTIPLESELECT
-                ):
-                    curr_question["option_choices"] = []
-                    for option_choice in question.options:
-                        curr_option_choice = dict()
-                        curr_option_choice["pk"] = option_choice.pk
-                        curr_option_choice["text"] = option_choice.text
-                        curr_question["option_choices"].append(curr_option_choice)
-
-                elif question.question_type == Question.QuestionType.SCALEMULTIPLECHOICE:
-                    curr_question["number_of_scale"] = question.number_of_scale
-                elif question.question_type == Question.QuestionType.MULTIPLETEXT:
-                    curr_question["number_of_text"] = question.number_of_text
-                curr_section["questions"].append(curr_question)
-            data["sections"].append(curr_section)
+
+        def question_data(question):
+            curr_question = dict()
+            curr_question["pk"] = question.pk
+            curr_question["text"] = question.text
+            curr_question["is_required"] = question.is_required
+            curr_question["question_type"] = question.question_type
+            curr_question["phrased_positively"] = question.phrased_positively
+            curr_question["gamified"] = False
+            curr_question["artifact_reviews"] = []
+            for artifact_review_id in artifact_review_ids:
+                curr_question["artifact_reviews"].append([])
+                for answer in question_answers(answers, question, artifact_review_id):
+                    answer_data = {}
+                    answer_data["page"] = answer["page"]
+                    answer_data["text"] = answer["answer_text"]
+                    answer_data["artifact_review_id"] = artifact_review_id
+                    answer_data["artifact_reviewer_id"] = answer["reviewer_id"]
+                    curr_question["artifact_reviews"][-1].append(answer_data)
+            if question.question_type == Question.QuestionType.SLIDEREVIEW:
+                key = artifact.file.name
+                path = f"http://{settings.ALLOWED_HOSTS[2]}:8000{artifact.file.url}"
+
+                if settings.USE_S3:
+                    path = generate_presigned_url(key, http_method="GET")
+                curr_question["file_path"] = path
+            if (
+                question.question_type == Question.QuestionType.MULTIPLECHOICE
+                or question.question_type == Question.QuestionType.MULTIPLESELECT
+            ):
+                curr_question["option_choices"] = option_choices_data(question)
+            elif question.question_type == Question.QuestionType.SCALEMULTIPLECHOICE:
+                curr_question["number_of_scale"] = question.number_of_scale
+            elif question.question_type == Question.QuestionType.MULTIPLETEXT:
+                curr_question["number_of_text"] = question.number_of_text
+            return curr_question
+
+        data["sections"] = survey_sections_data(survey_template, question_data)
         return Response(data)
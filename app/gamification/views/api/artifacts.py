@@ -20,6 +20,7 @@ from app.gamification.models.user import CustomUser
 from app.gamification.serializers.answer import ArtifactReviewSerializer
 from app.gamification.utils.auth import get_user_pk
 from app.gamification.utils.levels import inv_level_func, level_func
+from app.gamification.utils.review_assign import assign_late_artifact, assign_team_artifact
 from app.gamification.utils.s3 import generate_presigned_post, generate_presigned_url
 
 
@@ -47,94 +48,14 @@ class AssignmentArtifact(generics.ListCreateAPIView):
 
         return artifact
     
-    def next_classmate(self, user_index, classmates):
-        if user_index == len(classmates) - 1:
-            if classmates[0].user.is_staff:
-                return self.next_classmate(0, classmates)
-            return classmates[0]
-        else:
-            if classmates[user_index + 1].user.is_staff:
-                return self.next_classmate(user_index + 1, classmates)
-            return classmates[user_index + 1]
-        
-    def next_n_classmates(self, classmates, user_index, n):
-        result = []
-        current_index = user_index
-
-        while n > 0 and len(result) < len(classmates) - 1:  # Prevent infinite loop
-            current_index = (current_index + 1) % len(classmates)
-            if not classmates[current_index].user.is_staff:
-                result.append(classmates[current_index])
-                n -= 1
-
-        return result
-    #### conflict with self when the second round
-    def get_sublist(self, source_list, k, m):
-        if len(source_list) < 2 * k:
-            start_index = 0
-        else:
-            start_index = 2 * k + 1
-
-        return_list = []
-
-        while len(return_list) < m:
-            return_list.append(source_list[start_index % len(source_list)])
-            start_index += 1  # Move to next index
-        
-        return return_list
-
-
     def create_artifact_review(self, artifact, user, course, assignment_type, entity):
-        cur_assignment_min = Assignment.objects.filter(assignment_name=artifact.assignment)[0].min_reviewers
         if assignment_type == Assignment.AssigmentType.Team:
-            team_members = [i.pk for i in entity.members]
-            registrations = [i for i in Registration.objects.filter(course=course) if i.user.pk not in team_members]
-            for registration in registrations:
-                user = registration.user
-                if not user.is_staff:
-                    # create artifact review if it doesn't exist
-                    if not ArtifactReview.objects.filter(artifact=artifact, user=registration).exists():
-                        artifact_review = ArtifactReview(artifact=artifact, user=registration)
-                        artifact_review.save()
+            assign_team_artifact(artifact)
         else:
-            classmates = Registration.objects.filter(course=course).exclude(user__is_staff=True).order_by("id")
-            print("classmates_without_staff", classmates)
-            ##find the starting point
-            # for i in range(len(classmates)):
-            #     if classmates[i].user == user:
-            #         sublist_classmates = self.next_n_classmates(classmates, i, cur_assignment_min)
-            #         print("sublist_classmates", sublist_classmates)
-            #         for next_one in sublist_classmates:
-            #             if not ArtifactReview.objects.filter(artifact=artifact, user=next_one).exists():
-            #                 artifact_review = ArtifactReview(artifact=artifact, user=next_one)
-            #                 artifact_review.save()
-            #         break
-                    
-                    
-                    
-            ## ----------------- old code -----------------
-            # if not user.is_staff:
-            #     for i in range(len(classmates)):
-            #         if classmates[i].user == user:
-            #             next_n_classmates = self.next_n_classmates(i, classmates, cur_assignment_min)
-            #             for next_one in next_n_classmates:
-            #                 if not ArtifactReview.objects.filter(artifact=artifact, user=next_one).exists():
-            #                     artifact_review = ArtifactReview(artifact=artifact, user=next_one)
-            #                     artifact_review.save()
-            #             break
-            
-            # registrations = [i for i in Registration.objects.filter(course=course) if i.user != user]
-            # if not user.is_staff:
-            #     for single_registration in registrations:
-            #         print("create artifact review ", single_registration)
-            #         single_user = single_registration.user
-            #         # create artifact review if it doesn't exist
-            #         if (
-            #             not ArtifactReview.objects.filter(artifact=artifact, user=single_registration).exists()
-            #             and not single_user.is_staff
-            #         ):
-            #             artifact_review = ArtifactReview(artifact=artifact, user=single_registration)
-            #             artifact_review.save()
+            # Reviews are assigned in batch when the survey is released, late submissions are topped up here
+            survey = artifact.assignment.survey
+            if survey is not None and survey.is_released:
+                assign_late_artifact(artifact)
 
     @swagger_auto_schema(
         operation_description="Upload an artifact for an assignment",
@@ -1,4 +1,3 @@
-import copy
 from datetime import datetime
 
 from django.forms import model_to_dict
@@ -9,15 +8,18 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 
 from app.gamification.models import Assignment, Course, CustomUser
-from app.gamification.models.artifact import Artifact
-from app.gamification.models.artifact_review import ArtifactReview
-from app.gamification.models.option_choice import OptionChoice
-from app.gamification.models.question import Question
 from app.gamification.models.survey import FeedbackSurvey
 from app.gamification.models.survey_section import SurveySection
 from app.gamification.serializers import AssignmentSerializer
 from app.gamification.serializers.survey import SurveySerializer
 from app.gamification.utils.auth import get_user_pk
+from app.gamification.utils.survey_edit import apply_survey_edit, clone_survey_tree, survey_is_locked
+from app.gamification.utils.survey_tree import (
+    bump_survey_version,
+    survey_etag,
+    survey_not_modified,
+    survey_sections_data,
+)
 
 
 class AssignmentSurvey(generics.ListCreateAPIView):
@@ -32,42 +34,15 @@ class AssignmentSurvey(generics.ListCreateAPIView):
             return Response(
                 status=status.HTTP_404_NOT_FOUND
             )
+        etag = survey_etag(survey)
+        if survey_not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
         data = dict()
         data["pk"] = survey.pk
         data["name"] = survey.name
         data["instructions"] = survey.instructions
-        data["sections"] = []
-        for section in survey.sections:
-            curr_section = dict()
-            curr_section["pk"] = section.pk
-            curr_section["title"] = section.title
-            curr_section["is_required"] = section.is_required
-            curr_section["questions"] = []
-            for question in section.questions:
-                curr_question = dict()
-                curr_question["pk"] = question.pk
-                curr_question["text"] = question.text
-                curr_question["is_required"] = question.is_required
-                curr_question["phrased_positively"] = question.phrased_positively
-                curr_question["gamified"] = question.gamified
-                curr_question["question_type"] = question.question_type
-                if (
-                    question.question_type == Question.QuestionType.MULTIPLECHOICE
-                    or question.question_type == Question.QuestionType.MULTIPLESELECT
-                ):
-                    curr_question["option_choices"] = []
-                    for option_choice in question.options:
-                        curr_option_choice = dict()
-                        curr_option_choice["pk"] = option_choice.pk
-                        curr_option_choice["text"] = option_choice.text
-                        curr_question["option_choices"].append(curr_option_choice)
-                elif question.question_type == Question.QuestionType.SCALEMULTIPLECHOICE:
-                    curr_question["number_of_scale"] = question.number_of_scale
-                else:
-                    curr_question["number_of_text"] = question.number_of_text
-                curr_section["questions"].append(curr_question)
-            data["sections"].append(curr_section)
-        return Response(data)
+        data["sections"] = survey_sections_data(survey)
+        return Response(data, headers={"ETag": etag})
 
     @swagger_auto_schema(
         operation_description="Create a new survey, template_name is \
@@ -85,7 +60,7 @@ class AssignmentSurvey(generics.ListCreateAPIView):
     )
     def post(self, request, assignment_id, *args, **kwargs):
         # Get survey_id from the request. If survey_id is -1, it means we are using a template,
-        # hence we need to deepcopy the sections and questions
+        # hence we need to clone its sections, questions and option choices
         survey_id = request.data.get("survey_id")
         is_using_template = False
 
@@ -94,7 +69,6 @@ class AssignmentSurvey(generics.ListCreateAPIView):
             # Reuse template
             is_using_template = True
             survey_template = FeedbackSurvey.objects.get(id=survey_id)
-            survey_sections = survey_template.sections.all()
 
         # Get request parameters
         user_id = request.data.get("user_id")
@@ -116,20 +90,8 @@ class AssignmentSurvey(generics.ListCreateAPIView):
 
         # Copy from existing survey, no need to create an artifact section
         if is_using_template:
-            new_survey_sections = copy.deepcopy(survey_sections)
-            for new_section in new_survey_sections:
-                questions = Question.objects.filter(section=new_section.pk)
-                # Clear the primary key
-                new_section.pk = None
-                new_section.survey = feedback_survey
-                new_section.save()
-
-                # Iterate through questions of the copied section
-                for question in questions:
-                    new_question = copy.deepcopy(question)
-                    new_question.pk = None
-                    new_question.section = new_section
-                    new_question.save()
+            clone_survey_tree(survey_template, feedback_survey)
+            bump_survey_version(feedback_survey.id)
         else:
             # Create the artifact section
             SurveySection.objects.create(
@@ -162,68 +124,25 @@ class AssignmentSurvey(generics.ListCreateAPIView):
     def patch(self, request, assignment_id, *args, **kwargs):
         survey_info = request.data.get("survey_info")
         survey = get_object_or_404(FeedbackSurvey, id=survey_info["pk"])
-        sections = SurveySection.objects.filter(survey=survey)
-        # Update all artifact reviews with the survey template to be INCOMPLETE
-        assignment = get_object_or_404(Assignment, id=assignment_id)
-        artifacts = Artifact.objects.filter(assignment=assignment)
-        for artifact in artifacts:
-            artifact_reviews = ArtifactReview.objects.filter(artifact=artifact)
-            for artifact_review in artifact_reviews:
-                if artifact_review.status == ArtifactReview.ArtifactReviewType.COMPLETED:
-                    return Response(
-                        {"message": "Cannot modify survey that has already been completed."},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+        get_object_or_404(Assignment, id=assignment_id)
+        # Checked before the release guard: a survey with a completed review is locked for good,
+        # the release guard only turns away released surveys nobody has completed yet
+        if survey_is_locked(survey):
+            return Response(
+                {"message": "Cannot modify survey that has already been completed."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        # Delete all previous survey contents
-        for section in sections:
-            questions = Question.objects.filter(section=section)
-            for question in questions:
-                for option_choice in question.options.all():
-                    option_choice.delete()
-                for option_choice in question.options.all():
-                    option_choice.delete()
-                question.delete()
-            section.delete()
-        for section in survey_info["sections"]:
-            section_template = SurveySection()
-            section_template.survey = survey
-            section_template.title = section["title"]
-            section_template.is_required = section["is_required"]
-            section_template.save()
-            for question in section["questions"]:
-                question_template = Question()
-                question_template.section = section_template
-                question_template.text = question["text"]
-                question_template.is_required = question["is_required"]
-                question_template.question_type = question["question_type"]
-                question_template.phrased_positively = question["phrased_positively"]
-                question_template.gamified = question["gamified"]
-                if question["question_type"] == Question.QuestionType.SCALEMULTIPLECHOICE:
-                    question_template.number_of_scale = question["number_of_scale"]
-                elif question["question_type"] == Question.QuestionType.MULTIPLETEXT:
-                    question_template.number_of_text = question["number_of_text"]
-                if question["question_type"] == Question.QuestionType.NUMBER:
-                    question_template.min = question["min"] if "min" in question else 0
-                    question_template.max = question["max"] if "max" in question else 100
+        # Reviews in progress answer the snapshot frozen at release, an edit of the live tree
+        # would change or delete the questions and options their answers point to
+        if survey.is_released:
+            return Response(
+                {"message": "Cannot modify survey that has already been released."},
+                status=status.HTTP_409_CONFLICT,
+            )
 
-                question_template.save()
-                if (
-                    question["question_type"] == Question.QuestionType.MULTIPLECHOICE
-                    or question["question_type"] == Question.QuestionType.MULTIPLESELECT
-                ):
-                    for option in question_template.options:
-                        option.delete()
-                    for option_choice in question["option_choices"]:
-                        option_choice_template = OptionChoice()
-                        option_choice_template.question = question_template
-                        option_choice_template.text = option_choice["text"]
-                        option_choice_template.save()
-                else:
-                    option_choice = OptionChoice()
-                    option_choice.question = question_template
-                    # No text field for other Question types
-                    option_choice.save()
+        apply_survey_edit(survey, survey_info["sections"])
+        bump_survey_version(survey.id)
 
         return Response(status=200)
 
@@ -17,6 +17,7 @@ from app.gamification.models import (
 )
 from app.gamification.serializers import EntitySerializer
 from app.gamification.utils.auth import get_user_pk
+from app.gamification.utils.review_assign import delete_artifact_reviews
 
 
 class MemberList(generics.RetrieveUpdateDestroyAPIView):
@@ -152,9 +153,7 @@ class MemberList(generics.RetrieveUpdateDestroyAPIView):
             membership.save()
 
             # Delete artifact reviews for updated team
-            artifacts = Artifact.objects.filter(entity=team)
-            for artifact in artifacts:
-                ArtifactReview.objects.filter(artifact=artifact, user=registration).delete()
+            delete_artifact_reviews(ArtifactReview.objects.filter(artifact__entity=team, user=registration))
 
         course = get_object_or_404(Course, pk=course_id)
         user_id = get_user_pk(request)
@@ -232,11 +231,12 @@ class MemberList(generics.RetrieveUpdateDestroyAPIView):
             return Response({"message": "Cannot delete the last instructor"}, status=status.HTTP_400_BAD_REQUEST)
 
         # Delete all the user's artifact reviews
-        ArtifactReview.objects.filter(user=registration).delete()
+        delete_artifact_reviews(ArtifactReview.objects.filter(user=registration))
 
         # Delete all the user's artifacts
         entity = Entity.objects.filter(registration=registration)
         if entity.exists() and entity[0].number_members == 1:
+            delete_artifact_reviews(ArtifactReview.objects.filter(artifact__entity=entity[0]))
             Artifact.objects.filter(entity=entity[0]).delete()
             entity[0].delete()
 
@@ -299,9 +299,7 @@ class MemberList(generics.RetrieveUpdateDestroyAPIView):
             membership.save()
 
             # Delete artifact reviews for updated team
-            artifacts = Artifact.objects.filter(entity=team)
-            for artifact in artifacts:
-                ArtifactReview.objects.filter(artifact=artifact, user=registration).delete()
+            delete_artifact_reviews(ArtifactReview.objects.filter(artifact__entity=team, user=registration))
 
         # Ensure the user is an instructor
         if not user.is_staff:
@@ -1,4 +1,5 @@
 import copy
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from app.gamification.models.artifact import Artifact
 from app.gamification.models.artifact_review import ArtifactReview
@@ -10,10 +11,8 @@ from rest_framework.response import Response
 
 from app.gamification.models.assignment import Assignment
 from app.gamification.models.survey import FeedbackSurvey
-from app.gamification.models.option_choice import OptionChoice
-from app.gamification.models.question import Question
-from app.gamification.models.survey_section import SurveySection
 from app.gamification.serializers.survey import SurveySerializer
+from app.gamification.utils.survey_tree import survey_etag, survey_not_modified, survey_sections_data
 
 
 class SurveyDetail(generics.RetrieveUpdateDestroyAPIView):
@@ -27,42 +26,15 @@ class SurveyDetail(generics.RetrieveUpdateDestroyAPIView):
     )
     def get(self, request, survey_pk, *args, **kwargs):
         survey_template = get_object_or_404(FeedbackSurvey, id=survey_pk)
+        etag = survey_etag(survey_template)
+        if survey_not_modified(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
         data = dict()
         data["pk"] = survey_template.pk
         data["name"] = survey_template.name
         data["instructions"] = survey_template.instructions
-        data["sections"] = []
-        for section in survey_template.sections:
-            curr_section = dict()
-            curr_section["pk"] = section.pk
-            curr_section["title"] = section.title
-            curr_section["is_required"] = section.is_required
-            curr_section["questions"] = []
-            for question in section.questions:
-                curr_question = dict()
-                curr_question["pk"] = question.pk
-                curr_question["text"] = question.text
-                curr_question["is_required"] = question.is_required
-                curr_question["phrased_positively"] = question.phrased_positively
-                curr_question["gamified"] = question.gamified
-                curr_question["question_type"] = question.question_type
-                if (
-                    question.question_type == Question.QuestionType.MULTIPLECHOICE
-                    or question.question_type == Question.QuestionType.MULTIPLESELECT
-                ):
-                    curr_question["option_choices"] = []
-                    for option_choice in question.options:
-                        curr_option_choice = dict()
-                        curr_option_choice["pk"] = option_choice.pk
-                        curr_option_choice["text"] = option_choice.text
-                        curr_question["option_choices"].append(curr_option_choice)
-                elif question.question_type == Question.QuestionType.SCALEMULTIPLECHOICE:
-                    curr_question["number_of_scale"] = question.number_of_scale
-                else:
-                    curr_question["number_of_text"] = question.number_of_text
-                curr_section["questions"].append(curr_question)
-            data["sections"].append(curr_section)
-        return Response(data)
+        data["sections"] = survey_sections_data(survey_template)
+        return Response(data, headers={"ETag": etag})
 
     @swagger_auto_schema(
         operation_description="Update a survey template",
@@ -84,6 +56,7 @@ class SurveyDetail(generics.RetrieveUpdateDestroyAPIView):
         instructions = request.data.get("instructions")
         survey.name = name
         survey.instructions = instructions
+        survey.version = F("version") + 1
         survey.save()
         serializer = self.get_serializer(survey)
         return Response(serializer.data)
@@ -8,6 +8,7 @@ from rest_framework.response import Response
 
 from app.gamification.views.api.artifact_review import (
     ArtifactReviewDetails,
+    ArtifactReviewDraft,
     ArtifactReviewersList,
     ArtifactReviewIpsatization,
     ArtifactReviewStatus,
@@ -154,17 +155,23 @@ urlpatterns = [
         ArtifactReviewersList.as_view(),
         name="artifact-review-list",
     ),
+    # GET ipsatization results from artifact_reviews
+    path(
+        "courses/<str:course_id>/assignments/<str:assignment_id>/artifact_reviews/ipsatization/",
+        ArtifactReviewIpsatization.as_view(),
+        name="artifact-review-list",
+    ),
     # GET, PATCH artifact review
     path(
         "courses/<str:course_id>/assignments/<str:assignment_id>/artifact_reviews/<str:artifact_review_pk>/",
         ArtifactReviewDetails.as_view(),
         name="survey-detail",
     ),
-    # GET ipsatization results from artifact_reviews
+    # PATCH draft answers of an artifact review
     path(
-        "courses/<str:course_id>/assignments/<str:assignment_id>/artifact_reviews/ipsatization/",
-        ArtifactReviewIpsatization.as_view(),
-        name="artifact-review-list",
+        "courses/<str:course_id>/assignments/<str:assignment_id>/artifact_reviews/<str:artifact_review_pk>/draft/",
+        ArtifactReviewDraft.as_view(),
+        name="artifact-review-draft",
     ),
     # PATCH artifact review status
     path(
@@ -1,3 +1,4 @@
+from .default import *  # noqa: F401,F403
 from .default import BASE_DIR
 
 